@@ -0,0 +1,213 @@
+"""Local stand-in feed server serving synthetic RSS, Atom and YouTube feeds.
+
+Feeds are generated deterministically from their path, so repeated runs see the
+same bodies (and ETags) unless the server's generation is bumped:
+
+    /rss/<n>.xml                RSS 2.0 with HTML descriptions and inline images
+    /atom/<n>.xml               Atom with HTML content
+    /youtube.com/<n>.xml        YouTube-style Atom with media:group descriptions
+
+Usage: python benchmarks/feed_server.py [--port 8765] [--latency-ms 50] [--error-rate 0.02]
+"""
+import argparse
+import email.utils
+import hashlib
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+from xml.sax.saxutils import escape
+
+WORDS = ['lorem', 'ipsum', 'dolor', 'sit', 'amet', 'consectetur', 'adipiscing', 'elit', 'sed', 'do',
+         'eiusmod', 'tempor', 'incididunt', 'labore', 'dolore', 'magna', 'aliqua', '&amp;', 'café', 'naïve']
+
+
+@dataclass
+class ServerOptions:
+    """Knobs for the synthetic feeds and the server's behaviour."""
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    support_304: bool = True
+    entries: int = 10
+    description_words: int = 120
+    change_rate: float = 0.1
+    generation: int = 0
+    seed: int = 0
+
+
+def _html_description(rng: random.Random, words: int, image: str) -> str:
+    paragraphs = []
+    remaining = words
+    while remaining > 0:
+        count = min(remaining, rng.randint(20, 60))
+        text = ' '.join(rng.choice(WORDS) for _ in range(count))
+        paragraphs.append(f'<p class="p" style="margin:0" onclick="track()">{text} <a href="https://example.com/{rng.randint(0, 10**6)}" rel="nofollow">link</a></p>')
+        remaining -= count
+    return f'<div class="entry"><img src="{image}" width="640"/>{"".join(paragraphs)}<script>track()</script></div>'
+
+
+def render_feed(kind: str, feed_id: int, options: ServerOptions, now: Optional[datetime] = None) -> bytes:
+    """Build the body for one synthetic feed."""
+    changes = (feed_id * 2654435761 % 1000) < options.change_rate * 1000
+    generation = options.generation if changes else 0
+    rng = random.Random(f"{options.seed}:{kind}:{feed_id}:{generation}")
+    now = (now or datetime.now(timezone.utc)).replace(minute=0, second=0, microsecond=0)
+    spacing = timedelta(minutes=rng.randint(30, 600))
+    title = f"Synthetic {kind} feed {feed_id}"
+    entries = []
+    for n in range(options.entries):
+        published = now - spacing * n - timedelta(minutes=generation)
+        entry_id = f"{kind}-{feed_id}-{generation}-{n}"
+        link = f"https://example.com/{kind}/{feed_id}/{generation}/{n}"
+        entry_title = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(4, 10))).title()
+        description = _html_description(rng, options.description_words, f"https://img.example.com/{entry_id}.jpg")
+        if kind == 'rss':
+            entries.append(
+                f'<item><title>{escape(entry_title)}</title><link>{link}</link><guid>{entry_id}</guid>'
+                f'<pubDate>{email.utils.format_datetime(published)}</pubDate>'
+                f'<description>{escape(description)}</description></item>')
+        elif kind == 'atom':
+            entries.append(
+                f'<entry><title>{escape(entry_title)}</title><link href="{link}"/><id>{entry_id}</id>'
+                f'<updated>{published.isoformat()}</updated>'
+                f'<content type="html">{escape(description)}</content></entry>')
+        else:
+            video_id = hashlib.md5(entry_id.encode()).hexdigest()[:11]
+            plain = ' '.join(rng.choice(WORDS) for _ in range(options.description_words))
+            entries.append(
+                f'<entry><id>yt:video:{video_id}</id><yt:videoId>{video_id}</yt:videoId>'
+                f'<title>{escape(entry_title)}</title><link rel="alternate" href="https://www.youtube.com/watch?v={video_id}"/>'
+                f'<published>{published.isoformat()}</published>'
+                f'<media:group><media:title>{escape(entry_title)}</media:title>'
+                f'<media:description>{escape(plain)}</media:description></media:group></entry>')
+
+    if kind == 'rss':
+        body = f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>{title}</title>{"".join(entries)}</channel></rss>'
+    elif kind == 'atom':
+        body = f'<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom"><title>{title}</title>{"".join(entries)}</feed>'
+    else:
+        body = ('<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom" '
+                'xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns:media="http://search.yahoo.com/mrss/">'
+                f'<title>{title}</title>{"".join(entries)}</feed>')
+    return body.encode('utf-8')
+
+
+def parse_path(path: str) -> Optional[Tuple[str, int]]:
+    """Map a request path to (kind, feed_id)."""
+    parts = path.split('?')[0].strip('/').split('/')
+    if len(parts) != 2 or not parts[1].endswith('.xml'):
+        return None
+    kind = {'rss': 'rss', 'atom': 'atom', 'youtube.com': 'youtube'}.get(parts[0])
+    try:
+        return (kind, int(parts[1][:-4])) if kind else None
+    except ValueError:
+        return None
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients that stop reading early (streamed feeds) reset the connection; that is expected
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class FeedServer:
+    """Threaded HTTP server for synthetic feeds, runnable in the background."""
+
+    def __init__(self, options: ServerOptions, port: int = 0):
+        self.options = options
+        self.requests = 0
+        self.not_modified = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                opts = server.options
+                with server._lock:
+                    server.requests += 1
+                if opts.latency_ms or opts.latency_jitter_ms:
+                    time.sleep(max(0.0, opts.latency_ms + random.uniform(-1, 1) * opts.latency_jitter_ms) / 1000)
+                parsed = parse_path(self.path)
+                if parsed is None:
+                    self._reply(404, b'not found')
+                    return
+                if opts.error_rate and random.random() < opts.error_rate:
+                    with server._lock:
+                        server.errors += 1
+                    self._reply(500, b'internal error')
+                    return
+                body = render_feed(parsed[0], parsed[1], opts)
+                etag = '"%s"' % hashlib.sha1(body).hexdigest()
+                if opts.support_304 and self.headers.get('If-None-Match') == etag:
+                    with server._lock:
+                        server.not_modified += 1
+                    self._reply(304, b'', etag)
+                    return
+                self._reply(200, body, etag)
+
+            def _reply(self, status, body, etag=None):
+                self.send_response(status)
+                if etag and server.options.support_304:
+                    self.send_header('ETag', etag)
+                self.send_header('Content-Type', 'application/xml; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+        self.httpd = _QuietServer(('127.0.0.1', port), Handler)
+        self.port = self.httpd.server_address[1]
+        self._thread: Optional[threading.Thread] = None
+
+    def url_for(self, kind: str, feed_id: int) -> str:
+        prefix = 'youtube.com' if kind == 'youtube' else kind
+        return f"http://127.0.0.1:{self.port}/{prefix}/{feed_id}.xml"
+
+    def start(self) -> 'FeedServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--latency-jitter-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--no-304', action='store_true', help="never answer 304 Not Modified")
+    parser.add_argument('--entries', type=int, default=10)
+    parser.add_argument('--description-words', type=int, default=120)
+    args = parser.parse_args()
+
+    options = ServerOptions(latency_ms=args.latency_ms, latency_jitter_ms=args.latency_jitter_ms,
+                            error_rate=args.error_rate, support_304=not args.no_304,
+                            entries=args.entries, description_words=args.description_words)
+    server = FeedServer(options, args.port)
+    print(f"Serving synthetic feeds on http://127.0.0.1:{server.port}/ (rss/<n>.xml, atom/<n>.xml, youtube.com/<n>.xml)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,245 @@
+"""Offline benchmark suite: the full fetch pipeline against a local feed server, plus micro-benchmarks.
+
+For each corpus size (number of feeds) this runs:
+
+    pipeline/cold/<n>          run() with empty caches
+    pipeline/warm/<n>          run() again after a share of feeds changed (304s, memo hits, item store reuse)
+    clean_description/<n>      FeedProcessor._clean_description over every entry
+    extract_media_info/<n>     FeedProcessor._extract_media_info over every entry
+    process_feed_entries/<n>   FeedProcessor._process_feed_entries with empty caches
+    generate_all_items_json/<n> FeedProcessor._generate_all_items_json over the processed items
+
+Results are written as JSON ({"meta": ..., "results": {name: seconds}, "details": ...}). Pass
+--baseline with an earlier results file to compare against it; the exit status is 1 if any
+benchmark is slower than the baseline by more than --max-regression. The exit status is also 1
+if the streaming sanitizer's output differs from the BeautifulSoup reference on any sampled entry.
+
+Usage: python benchmarks/pipeline.py [--sizes 100,1000,10000] [--latency-ms 20] [--error-rate 0.02]
+                                     [--output results.json] [--baseline old.json]
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import feedparser
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fetch_feeds  # noqa: E402
+from feed_server import FeedServer, ServerOptions, render_feed  # noqa: E402
+
+KINDS = ['rss', 'rss', 'rss', 'atom', 'youtube']
+
+
+def feed_kind(feed_id):
+    return KINDS[feed_id % len(KINDS)]
+
+
+@contextlib.contextmanager
+def workdir():
+    """Run inside a scratch directory holding feeds.txt, the template and .cache/."""
+    previous = os.getcwd()
+    path = tempfile.mkdtemp(prefix='blink-bench-')
+    shutil.copy(os.path.join(ROOT, 'index.template.html'), path)
+    os.chdir(path)
+    try:
+        yield path
+    finally:
+        os.chdir(previous)
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def timed(func, repeat=1):
+    """Return (best wall time, last result) over repeat calls."""
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def bench_pipeline(size, options, results, details):
+    """Time run() cold and warm against the local feed server."""
+    server = FeedServer(options).start()
+    try:
+        with workdir():
+            with open('feeds.txt', 'w') as f:
+                f.write('#rss\n')
+                for feed_id in range(size):
+                    f.write(server.url_for(feed_kind(feed_id), feed_id) + '\n')
+
+            for label in ('cold', 'warm'):
+                if label == 'warm':
+                    options.generation += 1
+                requests_before = server.requests
+                elapsed, _ = timed(fetch_feeds.run)
+                with open(fetch_feeds.RUN_REPORT_PATH, 'r', encoding='utf-8') as f:
+                    report = json.load(f)
+                name = f"pipeline/{label}/{size}"
+                results[name] = elapsed
+                fetch = report['fetch'] or {}
+                details[name] = {
+                    'phases': report['phases'],
+                    'items': report['items'],
+                    'requests': server.requests - requests_before,
+                    'successful': fetch.get('successful'),
+                    'failed': fetch.get('failed'),
+                    'not_modified': fetch.get('not_modified'),
+                    'unchanged': fetch.get('unchanged'),
+                }
+    finally:
+        options.generation = 0
+        server.stop()
+
+
+def parse_corpus(size, options):
+    """Parse one synthetic body per feed, outside of any timed section."""
+    corpus = []
+    for feed_id in range(size):
+        kind = feed_kind(feed_id)
+        url = f"http://127.0.0.1/{'youtube.com' if kind == 'youtube' else kind}/{feed_id}.xml"
+        corpus.append((url, kind == 'youtube', feedparser.parse(render_feed(kind, feed_id, options))))
+    return corpus
+
+
+def bench_micro(size, options, repeat, results, details):
+    """Time the per-entry hot paths over the synthetic corpus."""
+    corpus = parse_corpus(size, options)
+    entries = [(is_youtube, entry) for _, is_youtube, feed in corpus for entry in feed.entries]
+
+    with workdir():
+        processor = fetch_feeds.FeedProcessor()
+
+        results[f"clean_description/{size}"], _ = timed(
+            lambda: [processor._clean_description(entry) for _, entry in entries], repeat)
+        results[f"extract_media_info/{size}"], _ = timed(
+            lambda: [processor._extract_media_info(entry, is_youtube) for is_youtube, entry in entries], repeat)
+
+        # The fast sanitizer must keep producing the reference BeautifulSoup output
+        sample = [entry for _, entry in entries[:500]]
+        mismatches = sum(
+            1 for entry in sample
+            if processor._clean_description(entry)
+            != processor._clean_description_soup(processor._get_description_source(entry)))
+        details[f"clean_description/{size}"] = {'entries': len(entries), 'sanitizer_mismatches': mismatches}
+        processor.item_store.close()
+
+    # Each repeat gets fresh caches so every entry takes the cold path
+    def process_all():
+        with workdir():
+            fresh = fetch_feeds.FeedProcessor()
+            try:
+                return [item for url, _, feed in corpus for item in fresh._process_feed_entries(feed, url)]
+            finally:
+                fresh.item_store.close()
+
+    results[f"process_feed_entries/{size}"], items = timed(process_all, repeat)
+    items.sort(key=lambda item: item.published, reverse=True)
+    results[f"generate_all_items_json/{size}"], payload = timed(
+        lambda: processor._generate_all_items_json(items), repeat)
+    details[f"generate_all_items_json/{size}"] = {'items': len(items), 'bytes': len(payload.encode('utf-8'))}
+
+
+def compare(results, baseline_path, max_regression):
+    """Print a comparison with a baseline results file; return the regressed benchmark names."""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+    regressions = []
+    print(f"\n{'benchmark':<36}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, seconds in results.items():
+        if name not in baseline:
+            print(f"{name:<36}{'-':>12}{seconds:>11.3f}s{'new':>10}")
+            continue
+        change = seconds / baseline[name] - 1 if baseline[name] else 0.0
+        flag = ''
+        if change > max_regression:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f"{name:<36}{baseline[name]:>11.3f}s{seconds:>11.3f}s{change:>+9.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='100,1000,10000', help="comma-separated feed counts")
+    parser.add_argument('--entries', type=int, default=10, help="entries per feed")
+    parser.add_argument('--description-words', type=int, default=120)
+    parser.add_argument('--latency-ms', type=float, default=20.0)
+    parser.add_argument('--latency-jitter-ms', type=float, default=10.0)
+    parser.add_argument('--error-rate', type=float, default=0.02)
+    parser.add_argument('--change-rate', type=float, default=0.1, help="share of feeds that change between runs")
+    parser.add_argument('--no-304', action='store_true', help="server never answers 304 Not Modified")
+    parser.add_argument('--engine', choices=['threads', 'async'], default=fetch_feeds.FETCH_ENGINE)
+    parser.add_argument('--parse-processes', type=int, default=fetch_feeds.PARSE_PROCESSES,
+                        help="parse worker processes for the pipeline runs (0 parses on the fetch threads)")
+    parser.add_argument('--repeat', type=int, default=3, help="micro-benchmark repeats (best is kept)")
+    parser.add_argument('--skip-pipeline', action='store_true')
+    parser.add_argument('--skip-micro', action='store_true')
+    parser.add_argument('--output', default='benchmark-results.json')
+    parser.add_argument('--baseline', help="results file to compare against")
+    parser.add_argument('--max-regression', type=float, default=0.2, help="allowed slowdown vs baseline (0.2 = 20%%)")
+    parser.add_argument('--verbose', action='store_true', help="keep fetch_feeds INFO logging")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        fetch_feeds.logger.setLevel(logging.ERROR)
+    fetch_feeds.FETCH_ENGINE = args.engine
+    fetch_feeds.PARSE_PROCESSES = args.parse_processes
+    fetch_feeds.ADAPTIVE_SCHEDULING = False  # refetch every feed on the warm run
+    fetch_feeds.RETRY_BASE_DELAY = 0.05  # keep injected errors from dominating wall time
+
+    options = ServerOptions(latency_ms=args.latency_ms, latency_jitter_ms=args.latency_jitter_ms,
+                            error_rate=args.error_rate, support_304=not args.no_304,
+                            entries=args.entries, description_words=args.description_words,
+                            change_rate=args.change_rate)
+    results, details = {}, {}
+    for size in [int(s) for s in args.sizes.split(',') if s]:
+        if not args.skip_pipeline:
+            bench_pipeline(size, options, results, details)
+        if not args.skip_micro:
+            bench_micro(size, options, args.repeat, results, details)
+        for name in results:
+            if name.endswith(f"/{size}"):
+                print(f"{name:<36}{results[name]:>11.3f}s")
+
+    output = {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'options': vars(args),
+        },
+        'results': results,
+        'details': details,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(output, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    failed = False
+    mismatches = sum(d.get('sanitizer_mismatches', 0) for d in details.values())
+    if mismatches:
+        print(f"{mismatches} description(s) differ from the BeautifulSoup reference sanitizer")
+        failed = True
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.max_regression)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) regressed by more than {args.max_regression:.0%}")
+            failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
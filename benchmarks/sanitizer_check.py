@@ -0,0 +1,140 @@
+"""Differential check of the streaming description sanitizer against the BeautifulSoup reference.
+
+Every sample under benchmarks/sanitizer_corpus/ is cleaned both ways:
+
+    *.xml     a feed body; every entry is checked
+    *.json    a list of {"feed", "link", "description"} records, as the page stores them
+    *.html    one description fragment
+
+page_descriptions.json holds the real descriptions embedded in the checked-in index.html, and
+captured/ holds feed bodies downloaded from feeds.txt with --capture. synthetic/ holds hand-written
+edge cases. The exit status is 1 if any output differs. Capture the feed again whenever it trips
+the sanitizer, so the body that broke it stays in the corpus.
+
+Usage: python benchmarks/sanitizer_check.py [--corpus DIR]
+       python benchmarks/sanitizer_check.py --capture [--feeds feeds.txt] [--entries 10]
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+from urllib.parse import urlsplit
+
+import feedparser
+import requests
+from lxml import etree
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+import fetch_feeds  # noqa: E402
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sanitizer_corpus')
+ENTRY_TAGS = ('item', 'entry')
+
+
+def load_entries(corpus_dir):
+    """Yield (label, entry) for every sample in the corpus."""
+    for dir_path, dir_names, file_names in os.walk(corpus_dir):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            path = os.path.join(dir_path, file_name)
+            label = os.path.relpath(path, corpus_dir)
+            if file_name.endswith('.html'):
+                with open(path, 'r', encoding='utf-8') as f:
+                    yield label, feedparser.FeedParserDict(summary=f.read())
+            elif file_name.endswith('.json'):
+                with open(path, 'r', encoding='utf-8') as f:
+                    records = json.load(f)
+                for n, record in enumerate(records):
+                    yield f"{label}#{n} ({record.get('feed', '')})", feedparser.FeedParserDict(
+                        summary=record['description'])
+            elif file_name.endswith('.xml'):
+                with open(path, 'rb') as f:
+                    feed = feedparser.parse(f.read())
+                for n, entry in enumerate(feed.entries):
+                    yield f"{label}#{n}", entry
+
+
+def first_difference(a, b):
+    n = next((i for i, (x, y) in enumerate(zip(a, b)) if x != y), min(len(a), len(b)))
+    return n, a[max(0, n - 40):n + 40], b[max(0, n - 40):n + 40]
+
+
+def check(corpus_dir):
+    """Clean every sample both ways and return the number of mismatches."""
+    entries = list(load_entries(os.path.abspath(corpus_dir)))
+    previous = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix='blink-sanitizer-')
+    os.chdir(workdir)  # FeedProcessor opens its caches under .cache/
+    try:
+        processor = fetch_feeds.FeedProcessor()
+        mismatches = 0
+        for label, entry in entries:
+            fast = processor._clean_description(entry)
+            reference = processor._clean_description_soup(processor._get_description_source(entry))
+            if fast != reference:
+                mismatches += 1
+                offset, got, expected = first_difference(fast, reference)
+                print(f"MISMATCH {label} at offset {offset}\n  streaming: {got!r}\n  reference: {expected!r}")
+        processor.item_store.close()
+    finally:
+        os.chdir(previous)
+        shutil.rmtree(workdir, ignore_errors=True)
+    print(f"{len(entries)} samples, {mismatches} mismatches")
+    return mismatches
+
+
+def trim_feed(body, max_entries):
+    """Keep the first max_entries entries of a feed body; bodies that are not strict XML are kept whole."""
+    parser = etree.XMLParser(resolve_entities=False, no_network=True, huge_tree=False)
+    try:
+        root = etree.fromstring(body, parser)
+    except etree.XMLSyntaxError:
+        return body
+    entries = [el for el in root.iter(etree.Element) if etree.QName(el).localname in ENTRY_TAGS]
+    for element in entries[max_entries:]:
+        element.getparent().remove(element)
+    return etree.tostring(root, encoding='utf-8', xml_declaration=True)
+
+
+def capture(feeds_path, corpus_dir, max_entries):
+    """Download every feed in feeds_path into corpus_dir/captured/, keeping its first max_entries entries."""
+    out_dir = os.path.join(corpus_dir, 'captured')
+    os.makedirs(out_dir, exist_ok=True)
+    with open(feeds_path, 'r', encoding='utf-8') as f:
+        urls = [line.split()[0] for line in f if line.strip() and not line.startswith('#')]
+    session = requests.Session()
+    session.headers['User-Agent'] = fetch_feeds.USER_AGENT
+    for url in urls:
+        try:
+            response = session.get(url, timeout=fetch_feeds.REQUEST_TIMEOUT)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            print(f"SKIP {url}: {e}")
+            continue
+        parts = urlsplit(url)
+        name = re.sub(r'[^A-Za-z0-9]+', '_', f"{parts.netloc}{os.path.splitext(parts.path)[0]}?{parts.query}")
+        with open(os.path.join(out_dir, f"{name.strip('_')[:80]}.xml"), 'wb') as f:
+            f.write(trim_feed(response.content, max_entries))
+        print(f"Captured {url}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', default=CORPUS_DIR)
+    parser.add_argument('--capture', action='store_true', help='download the feeds into the corpus instead of checking')
+    parser.add_argument('--feeds', default=os.path.join(ROOT, 'feeds.txt'))
+    parser.add_argument('--entries', type=int, default=10, help='entries kept per captured feed')
+    args = parser.parse_args()
+
+    if args.capture:
+        capture(args.feeds, args.corpus, args.entries)
+        return
+    sys.exit(1 if check(args.corpus) else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark item serialization: legacy pretty-printed output vs the compact serializer.
+
+Usage: python benchmarks/serialization.py [item_count]
+"""
+import gzip
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import pytz
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+import fetch_feeds  # noqa: E402
+
+TZ = pytz.timezone(fetch_feeds.TIMEZONE)
+
+
+def generate_items(count, seed=0):
+    """Build a synthetic, newest-first item list shaped like FeedProcessor output."""
+    rng = random.Random(seed)
+    now = int(datetime.now(pytz.utc).timestamp())
+    feeds = [f"Feed number {n} - a reasonably long title" for n in range(400)]
+    words = ['lorem', 'ipsum', 'dolor', 'sit', 'amet', 'consectetur', 'adipiscing', 'elit', '&amp;', 'café']
+    items = []
+    for n in range(count):
+        youtube = rng.random() < 0.3
+        items.append(fetch_feeds.FeedItem(
+            id=f"https://example.com/item/{n}",
+            title=' '.join(rng.choice(words) for _ in range(rng.randint(4, 12))).title(),
+            link=f"https://example.com/item/{n}",
+            published=now - n * 60,
+            thumbnail='' if youtube else f"https://img.example.com/{n}.jpg",
+            feed_title=rng.choice(feeds),
+            video_id=f"vid{n:08d}" if youtube else None,
+            description='<p>' + ' '.join(rng.choice(words) for _ in range(rng.randint(10, 80))) + '</p>',
+        ))
+    return items
+
+
+def legacy_serialize(items):
+    """The serializer used before the compact path: copy every item into a dict, pretty-print."""
+    serializable_items = []
+    for item in items:
+        item_copy = {name: getattr(item, name) for name in fetch_feeds.FeedItem.__slots__ if name != 'sources'}
+        if item.sources:
+            item_copy['sources'] = item.sources
+        item_copy['published'] = datetime.fromtimestamp(item.published, TZ).isoformat()
+        serializable_items.append(item_copy)
+    return json.dumps(serializable_items, indent=2)
+
+
+def measure(name, func, items, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = func(items)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func(items)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    encoded = output.encode('utf-8')
+    return {
+        'name': name,
+        'seconds': round(best, 4),
+        'peak_bytes': peak,
+        'bytes': len(encoded),
+        'gzip_bytes': len(gzip.compress(encoded)),
+    }
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    items = generate_items(count)
+
+    compact = ''.join(fetch_feeds._iter_items_json(items, TZ))
+    assert json.loads(compact) == json.loads(legacy_serialize(items)), "compact output differs from legacy output"
+
+    results = [
+        measure('legacy indent=2', legacy_serialize, items),
+        measure('compact', lambda i: ''.join(fetch_feeds._iter_items_json(i, TZ)), items),
+        measure('compact + feed table', lambda i: ''.join(fetch_feeds._iter_items_json(i, TZ, feed_table=True)), items),
+    ]
+    print(f"{count} items")
+    print(f"{'serializer':<22}{'time (s)':>10}{'peak MB':>10}{'size KB':>10}{'gzip KB':>10}")
+    for r in results:
+        print(f"{r['name']:<22}{r['seconds']:>10.4f}{r['peak_bytes'] / 1e6:>10.1f}{r['bytes'] / 1024:>10.0f}{r['gzip_bytes'] / 1024:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -38,6 +38,18 @@ function formatUpdatedAt(dateStr) {
     return `${datePart}, ${timePart} PST`;
 }
 
+function expandFeedPayload(data) {
+    // Payloads may store feed titles once in a table and reference them by index
+    if (Array.isArray(data)) return data;
+    const feeds = data?.feeds || [];
+    return (data?.items || []).map(({ feed, ...item }) => {
+        if (feed === undefined) return item;
+        const expanded = { ...item, feed_title: feeds[feed] ?? '' };
+        if (item.sources) expanded.sources = item.sources.map(n => feeds[n] ?? '');
+        return expanded;
+    });
+}
+
 function makeLinksClickable(html) {
     // Only linkify URLs that aren't already inside anchor tags
     const urlRegex = /(?:^|[^">])((https?:\/\/[^\s<]+))/g;
@@ -132,6 +144,8 @@ document.addEventListener('DOMContentLoaded', () => {
     const loadingEl = $('loading');
     const keyboardHelp = $('keyboard-help');
     const setupForm = $('setup-form');
+    const searchBar = $('search-bar');
+    const searchInput = $('search-input');
 
     let feedData = [];
     let feedById = new Map();
@@ -139,6 +153,7 @@ document.addEventListener('DOMContentLoaded', () => {
     let showingDesc = false;
     let currentIdx = -1;
     let syncReady = false;
+    let searchIds = null; // ids matching the search query, null when not searching
 
     function isSeenVersion(item, itemMeta) {
         if (!itemMeta?.seen) return false;
@@ -166,13 +181,142 @@ document.addEventListener('DOMContentLoaded', () => {
     const dataEl = $('feed-data');
     if (dataEl) {
         try {
-            feedData = JSON.parse(dataEl.textContent);
+            feedData = expandFeedPayload(JSON.parse(dataEl.textContent));
             feedById = new Map(feedData.map(i => [i.id, i]));
         } catch (e) {
             console.error('Feed parse error:', e);
         }
     }
 
+    // Older days are split into content-hashed shards listed in the manifest;
+    // only the newest shard is inlined above.
+    let feedManifest = null;
+    const manifestEl = $('feed-manifest');
+    if (manifestEl) {
+        try {
+            feedManifest = JSON.parse(manifestEl.textContent);
+        } catch (e) {
+            console.error('Feed manifest parse error:', e);
+        }
+    }
+    let shardsLoaded = Promise.resolve(false);
+
+    async function loadRemainingShards() {
+        const shards = (feedManifest?.shards || []).filter(s => s.key !== feedManifest.inline);
+        if (!shards.length) return false;
+        const loaded = await Promise.all(shards.map(s =>
+            fetch(s.file)
+                .then(r => r.ok ? r.json().then(expandFeedPayload) : [])
+                .catch(e => { console.error('Feed shard load error:', s.file, e); return []; })
+        ));
+        const extra = loaded.flat().filter(i => i?.id && !feedById.has(i.id));
+        extra.forEach(i => feedById.set(i.id, i));
+        feedData = feedData.concat(extra);
+        pruneShardCache();
+        return extra.length > 0;
+    }
+
+    async function pruneShardCache() {
+        if (!('caches' in window) || !feedManifest) return;
+        try {
+            const files = feedManifest.shards.map(s => s.file).concat(feedManifest.search || []);
+            if (!files.length) return;
+            // The cache is shared by every feed list's page: only prune files directly in this page's data dir
+            const dir = new URL('.', new URL(files[0], location.href)).href;
+            const keep = new Set(files.map(file => new URL(file, location.href).href));
+            const cache = await caches.open('blink-data');
+            const requests = await cache.keys();
+            const stale = requests.filter(r => r.url.startsWith(dir) && !r.url.slice(dir.length).includes('/') && !keep.has(r.url));
+            await Promise.all(stale.map(r => cache.delete(r)));
+        } catch (e) {
+            console.error('Shard cache prune error:', e);
+        }
+    }
+
+    // Search uses the inverted index written next to the shards: sorted terms, each with the
+    // delta-encoded positions of the items containing it
+    let searchIndex = null;
+
+    function searchTokens(text) {
+        return (text.toLowerCase().match(/[\p{L}\p{N}_]+/gu) || []).filter(t => t.length >= 2);
+    }
+
+    function loadSearchIndex() {
+        if (!searchIndex) {
+            searchIndex = (feedManifest?.search ? fetch(feedManifest.search).then(r => r.ok ? r.json() : null) : Promise.resolve(null))
+                .then(index => index && { ...index, known: new Set(index.ids), decoded: new Map() })
+                .catch(e => { console.error('Search index load error:', e); return null; });
+        }
+        return searchIndex;
+    }
+
+    function termPositions(index, term) {
+        let positions = index.decoded.get(term);
+        if (!positions) {
+            let lo = 0, hi = index.terms.length;
+            while (lo < hi) {
+                const mid = (lo + hi) >> 1;
+                if (index.terms[mid] < term) lo = mid + 1; else hi = mid;
+            }
+            positions = new Set();
+            for (let n = lo; n < index.terms.length && index.terms[n].startsWith(term); n++) {
+                let position = 0;
+                index.postings[n].forEach(delta => { position += delta; positions.add(position); });
+            }
+            index.decoded.set(term, positions);
+        }
+        return positions;
+    }
+
+    async function search(query) {
+        const terms = searchTokens(query);
+        if (!terms.length) return null;
+        const index = await loadSearchIndex();
+        const ids = new Set();
+        if (index) {
+            const [first, ...rest] = terms.map(t => termPositions(index, t)).sort((a, b) => a.size - b.size);
+            first.forEach(position => { if (rest.every(p => p.has(position))) ids.add(index.ids[position]); });
+        }
+        // Items pushed after the index was built are matched directly
+        feedData.forEach(item => {
+            if (index?.known.has(item.id)) return;
+            const words = searchTokens(`${item.title} ${item.feed_title} ${(item.description || '').replace(/<[^>]*>/g, ' ')}`);
+            if (terms.every(t => words.some(w => w.startsWith(t)))) ids.add(item.id);
+        });
+        return ids;
+    }
+
+    function openSearch() {
+        if (!searchBar || !searchInput) return;
+        searchBar.hidden = false;
+        searchInput.focus();
+        loadSearchIndex();
+    }
+
+    function closeSearch() {
+        if (!searchBar || !searchInput) return;
+        searchInput.value = '';
+        searchInput.blur();
+        searchBar.hidden = true;
+        searchIds = null;
+        applyView(meta.items);
+    }
+
+    searchInput?.addEventListener('input', async () => {
+        const query = searchInput.value;
+        const ids = await search(query);
+        if (query !== searchInput.value) return; // a newer query is running
+        searchIds = ids;
+        applyView(meta.items);
+    });
+    searchInput?.addEventListener('keydown', e => {
+        if (e.key === 'Escape') { e.preventDefault(); closeSearch(); }
+    });
+    $('search-link')?.addEventListener('click', () => {
+        window.scrollTo(0, 0);
+        openSearch();
+    });
+
     const { gistId: hasGist, token: hasToken } = getGitHubConfig();
     const floatingBtns = $('floating-buttons');
     const updateHeader = document.querySelector('.update-header');
@@ -242,6 +386,7 @@ document.addEventListener('DOMContentLoaded', () => {
             if (feedEl) feedEl.style.display = '';
             if (markReadBtn) markReadBtn.disabled = false;
             renderAll();
+            startLiveData();
             if (!isSetup) openSettings();
         } catch (error) {
             setStatus(error.message || 'GitHub connection failed', 'error', targetStatus);
@@ -294,8 +439,9 @@ document.addEventListener('DOMContentLoaded', () => {
         const star = `<button class="star${starred ? ' starred' : ''}" data-id="${item.id}" aria-pressed="${starred}">&#9829;</button>`;
         const actions = star ? `<div class="item-actions">${star}</div>` : '';
         const source = item.feed_title || '';
+        const also = item.sources?.length ? `<span class="source-also" title="Also in ${item.sources.join(', ')}">+${item.sources.length}</span>` : '';
         const time = relTime(item.published);
-        const itemMeta = (source || time || expandBtn) ? `<div class="meta">${expandBtn}${source ? `<span class="source-dot" style="color:${feedColor(source)}">&#9679;</span><span class="source">${source}</span>` : ''}${source && time ? '<span class="meta-sep">&middot;</span>' : ''}${time ? `<span class="time">${time}</span>` : ''}</div>` : '';
+        const itemMeta = (source || time || expandBtn) ? `<div class="meta">${expandBtn}${source ? `<span class="source-dot" style="color:${feedColor(source)}">&#9679;</span><span class="source">${source}</span>${also}` : ''}${source && time ? '<span class="meta-sep">&middot;</span>' : ''}${time ? `<span class="time">${time}</span>` : ''}</div>` : '';
         return `<div class="item${showingDesc ? ' show-desc' : ''}" data-id="${item.id}" tabindex="0">${media}<h2><a href="${item.link}" target="_blank">${item.title}</a></h2>${itemMeta}${desc}${actions}</div>`;
     }
 
@@ -365,7 +511,18 @@ document.addEventListener('DOMContentLoaded', () => {
         const focused = currentIdx >= 0 ? visibleItems()[currentIdx]?.dataset.id : null;
         const byId = new Map((metaItems || []).map(i => [i.id, i]));
 
-        if (showingNew) {
+        if (searchIds) {
+            let count = 0;
+            all.forEach(item => {
+                const hide = !searchIds.has(item.dataset.id);
+                if (hide && videoPlayers.has(item.dataset.id)) stopVideoByItemId(item.dataset.id);
+                item.style.display = hide ? 'none' : '';
+                if (!hide) count++;
+            });
+            const sep = feedEl.querySelector('.sep');
+            if (sep) sep.style.display = 'none';
+            if (emptyEl) emptyEl.style.display = count ? 'none' : '';
+        } else if (showingNew) {
             let count = 0;
             all.forEach(item => {
                 const m = byId.get(item.dataset.id);
@@ -464,6 +621,10 @@ document.addEventListener('DOMContentLoaded', () => {
                     if (link) window.open(link.href, '_blank');
                 }
                 break;
+            case '/':
+                e.preventDefault();
+                openSearch();
+                break;
             case '?':
                 e.preventDefault();
                 if (keyboardHelp) {
@@ -574,6 +735,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
     markReadBtn?.addEventListener('click', async () => {
         if (markReadBtn.disabled || !syncReady) return;
+        await shardsLoaded;
         const currentMetaById = new Map((gistSync.getLocal().items || []).map(item => [item.id, item]));
         const unreadCount = feedData.filter(item => !isSeenVersion(item, currentMetaById.get(item.id))).length;
         if (unreadCount === 0) {
@@ -611,6 +773,79 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     });
 
+    // Older shards and `--serve` updates are fetched once sync is ready, whichever path got there
+    let liveDataStarted = false;
+    function startLiveData() {
+        if (liveDataStarted) return;
+        liveDataStarted = true;
+        shardsLoaded = loadRemainingShards().then(changed => {
+            if (changed) renderAll();
+            return changed;
+        });
+        subscribeToUpdates();
+    }
+
+    // `--serve` pushes items from each refresh over server-sent events
+    let updates = null;
+
+    function publishedTime(item) {
+        const time = new Date(item?.published).getTime();
+        return Number.isFinite(time) ? time : 0;
+    }
+
+    // Put pushed items where renderFeed would: by published time among the unstarred items
+    function insertPushedItems(fresh) {
+        const starredIds = new Set(getStarredItems(meta));
+        const placed = Array.from(feedEl.querySelectorAll('.item:not([data-archived])'))
+            .filter(el => !starredIds.has(el.dataset.id));
+        const elTime = el => publishedTime(feedById.get(el.dataset.id));
+        fresh.forEach(item => {
+            const wrap = document.createElement('div');
+            wrap.innerHTML = itemHtml(item);
+            const el = wrap.firstElementChild;
+            if (!el) return;
+            const time = publishedTime(item);
+            let idx = placed.findIndex(other => elTime(other) < time);
+            if (idx < 0) idx = placed.length;
+            const ref = idx < placed.length ? placed[idx] : (placed.length ? placed[placed.length - 1].nextSibling : feedEl.firstChild);
+            feedEl.insertBefore(el, ref);
+            placed.splice(idx, 0, el);
+        });
+    }
+    function subscribeToUpdates() {
+        const eventsEl = $('feed-events');
+        if (updates || !eventsEl || !('EventSource' in window)) return;
+        let url;
+        try {
+            url = JSON.parse(eventsEl.textContent).url;
+        } catch (e) {
+            console.error('Feed events parse error:', e);
+            return;
+        }
+        updates = new EventSource(url);
+        updates.addEventListener('items', e => {
+            let fresh;
+            try {
+                fresh = expandFeedPayload(JSON.parse(e.data)).filter(i => i?.id && !feedById.has(i.id));
+            } catch (err) {
+                console.error('Feed event parse error:', err);
+                return;
+            }
+            if (!fresh.length) return;
+            fresh.forEach(i => feedById.set(i.id, i));
+            // A feed polled late can bring items older than ones already shown
+            feedData = feedData.concat(fresh).sort((a, b) => publishedTime(b) - publishedTime(a));
+            if (!syncReady || !feedEl) return;
+            const anchor = Array.from(feedEl.querySelectorAll('.item')).find(el => el.getBoundingClientRect().bottom > 0);
+            const anchorTop = anchor?.getBoundingClientRect().top;
+            insertPushedItems(fresh);
+            applyView(meta.items);
+            if (anchor && window.scrollY > 0) window.scrollBy(0, anchor.getBoundingClientRect().top - anchorTop);
+            syncThumbAspect(feedEl);
+            toast(`${fresh.length} new item${fresh.length === 1 ? '' : 's'}`, 'info', 2000);
+        });
+    }
+
     async function initSync() {
         if (loadingEl) loadingEl.style.display = '';
         const success = await gistSync.syncOnStartup();
@@ -626,6 +861,7 @@ document.addEventListener('DOMContentLoaded', () => {
         renderAll();
         if (loadingEl) loadingEl.style.display = 'none';
         if (feedEl) feedEl.style.display = '';
+        startLiveData();
     }
     if (hasGist && hasToken) initSync();
 });
@@ -1,34 +1,166 @@
-import feedparser
+import argparse
+import cProfile
+import email.utils
+import gzip
+import hashlib
+import heapq
+import html
+import http.server
+import importlib
+import io
 import json
 import logging
+import math
+import multiprocessing
+import os
+import posixpath
+import queue
+import random
 import re
-import requests
+import shutil
+import sqlite3
+import sys
+import threading
 import time
+import types
+import urllib.error
+import urllib.request
 import warnings
+import zlib
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from functools import partial
+from itertools import groupby, islice, takewhile
+from operator import attrgetter, itemgetter
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Collection, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Any
+from urllib.parse import unquote, urlparse, urlsplit
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
 
-import pytz
-from bs4 import BeautifulSoup, MarkupResemblesLocatorWarning
+
+class _LazyModule(types.ModuleType):
+    """Stand-in for a third-party module that imports it on first attribute access."""
+
+    def __init__(self, name: str, on_import: Optional[Callable[[types.ModuleType], None]] = None):
+        super().__init__(name)
+        self._on_import = on_import
+
+    def __getattr__(self, attr: str) -> Any:
+        module = importlib.import_module(self.__name__)
+        if self._on_import:
+            self._on_import(module)
+        # Later lookups find the module's attributes directly and skip __getattr__
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def _ignore_locator_warnings(bs4: types.ModuleType) -> None:
+    warnings.filterwarnings("ignore", category=bs4.MarkupResemblesLocatorWarning)
+
+
+# Heavy dependencies load only on the paths that use them; --check runs on the standard library alone
+feedparser = _LazyModule('feedparser')
+pytz = _LazyModule('pytz')
+requests = _LazyModule('requests')
+bs4 = _LazyModule('bs4', on_import=_ignore_locator_warnings)
+etree = _LazyModule('lxml.etree')
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Suppress specific warnings
-warnings.filterwarnings("ignore", category=MarkupResemblesLocatorWarning)
-
 # Configuration
 TIMEZONE = 'America/Los_Angeles'
 ITEMS_RETENTION_DAYS = 5
-INCLUDE_YOUTUBE_SHORTS = False
+INCLUDE_YOUTUBE_SHORTS = False  # default for YouTube feeds without a shorts= option
 USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36'
 REQUEST_TIMEOUT = 30
 MAX_WORKERS = 10
+FETCH_ENGINE = 'threads'  # 'threads' or 'async' (async requires aiohttp)
+ASYNC_MAX_CONCURRENCY = 32
+ASYNC_PER_HOST_LIMIT = 4
+HOST_CONNECTION_LIMITS = {  # concurrent connections per host, for both fetch engines
+    'www.reddit.com': 2,
+    'www.youtube.com': 8,
+}
+HTTP_POOL_HOSTS = 100  # hosts whose keep-alive connections stay pooled on the thread engine
+HTTP2_HOSTS = frozenset()  # hosts fetched over HTTP/2 on the thread engine, e.g. {'www.youtube.com'} (requires httpx[http2])
 MAX_RETRIES = 3
 RETRY_BASE_DELAY = 1.0  # seconds
+RETRY_MAX_DELAY = 30.0  # seconds; cap for the jittered exponential backoff
+RETRY_AFTER_MAX = 120  # seconds; a longer Retry-After skips the host for the rest of the run
+THROTTLE_STATUSES = frozenset([429, 503])
+HOST_RATE_LIMIT = 0  # requests per second for hosts not listed below; 0 for no limit
+HOST_RATE_LIMITS = {
+    'www.reddit.com': 0.5,
+    'www.youtube.com': 10.0,
+}
+HOST_RATE_BURST = 2  # requests a host may receive back to back before its rate applies
+CIRCUIT_BREAKER_THRESHOLD = 3  # consecutive throttled responses before a host's remaining feeds fail fast
+CIRCUIT_BREAKER_COOLDOWN = 3600  # seconds a tripped host stays skipped, across runs
+CACHE_DIR = '.cache'
+FEED_CACHE_PATH = os.path.join(CACHE_DIR, 'feed_cache.json')
+ITEM_STORE_PATH = os.path.join(CACHE_DIR, 'items.sqlite3')
+DESCRIPTION_MEMO_PATH = os.path.join(CACHE_DIR, 'description_memo.json')
+DESCRIPTION_MEMO_MAX_ENTRIES = 20000
+FEED_SCHEDULE_PATH = os.path.join(CACHE_DIR, 'feed_schedule.json')
+ADAPTIVE_SCHEDULING = True  # only fetch feeds that are due based on their posting cadence
+SCHEDULE_MIN_INTERVAL = 3600  # seconds; matches the hourly workflow
+SCHEDULE_MAX_INTERVAL = 24 * 3600
+SCHEDULE_MAX_FAILURE_BACKOFF = 12 * 3600
+SCHEDULE_CADENCE_FACTOR = 0.5  # poll twice per typical gap between posts
+SCHEDULE_GRACE = 10 * 60  # treat feeds due shortly after this run as due now
+SERVE_HOST = '127.0.0.1'
+SERVE_PORT = 8080
+SERVE_TICK = 60  # seconds between due checks in --serve mode
+SERVE_MIN_INTERVAL = 5 * 60  # shortest per-feed poll interval in --serve mode (replaces SCHEDULE_MIN_INTERVAL)
+SERVE_KEEPALIVE = 25  # seconds between comments that keep idle event streams open
+SERVE_EVENT_BACKLOG = 32  # pushed events replayed to clients that reconnect with Last-Event-ID
+SERVE_FILES = ('/', '/index.html', '/manifest.json', '/sw.js')  # with SERVE_DIRS, FEED_DATA_DIR and THUMBNAIL_DIR;
+SERVE_DIRS = ('/css/', '/js/', '/images/')  # anything else in the working directory is a 404
+RUN_REPORT_PATH = os.path.join(CACHE_DIR, 'run_report.json')
+CIRCUIT_BREAKER_PATH = os.path.join(CACHE_DIR, 'circuit_breaker.json')
+PRECHECK_STATE_PATH = os.path.join(CACHE_DIR, 'precheck.json')
+FEED_REGISTRY_PATH = os.path.join(CACHE_DIR, 'feed_registry.json')
+FEED_REGISTRY_VERSION = 1  # bump when the compiled format or the compile rules change
+SEARCH_TOKENS_PATH = os.path.join(CACHE_DIR, 'search_tokens.json')
+THUMBNAIL_INDEX_PATH = os.path.join(CACHE_DIR, 'thumbnails.json')
+THUMBNAIL_CACHE_DIR = os.path.join(CACHE_DIR, 'thumbnails')
+EXIT_NOTHING_CHANGED = 3  # exit status of --check when a full run would not change the page
+YOUTUBE_CHANNEL_CACHE_PATH = os.path.join(CACHE_DIR, 'youtube_channels.json')
+YOUTUBE_CHANNEL_CACHE_TTL_DAYS = 30
+YOUTUBE_CHANNEL_FAILURE_TTL_HOURS = 12
+DESCRIPTION_MAX_LENGTH = 500
+SHARD_FEED_DATA = True  # write per-day JSON shards and inline only the newest one
+FEED_DATA_DIR = 'data'
+FEED_TITLE_TABLE = False  # store feed titles once per payload and reference them by index
+PRECOMPRESS_FEED_DATA = False  # write .gz (and .br when brotli is installed) next to each shard
+SEARCH_INDEX = True  # write an inverted index of titles, feed names and descriptions for client-side search
+SEARCH_MIN_TOKEN_LENGTH = 2
+THUMBNAIL_CACHE = False  # serve downscaled local copies of thumbnails (requires Pillow)
+THUMBNAIL_DIR = 'thumbs'  # the thumbnails on the page, copied from THUMBNAIL_CACHE_DIR
+THUMBNAIL_MAX_SIZE = (800, 800)  # cards are at most 800px wide
+THUMBNAIL_FORMAT = 'WEBP'
+THUMBNAIL_QUALITY = 75
+THUMBNAIL_WORKERS = 8
+THUMBNAIL_MAX_BYTES = 10 * 1024 * 1024  # larger images keep their remote URL
+THUMBNAIL_RETRY_AFTER = 24 * 3600  # seconds before a failed image is downloaded again
+STREAM_FEEDS = True  # parse responses as they arrive and stop reading past the retention window
+STREAM_CHUNK_SIZE = 16 * 1024
+STREAM_STALE_ENTRIES = 3  # consecutive entries older than the cutoff before the rest of a feed is skipped
+PARSE_PROCESSES = 0  # >1 parses and cleans feeds in that many worker processes instead of the fetch threads
+PARSE_QUEUE_SIZE = 32  # downloaded responses waiting for a parse worker before downloads block
+DEDUPE_ITEMS = True  # merge items that link to the same article from several feeds
+DEDUPE_TITLES = False  # also merge items from different feeds whose titles are near-identical
+DEDUPE_TITLE_THRESHOLD = 0.8  # Jaccard similarity of title word pairs
+MAX_ITEMS = 0  # newest items written to the page; 0 keeps everything inside the retention window
+MAX_ITEMS_PER_FEED = 0  # newest items kept from each feed; 0 for no limit
+TRACKING_QUERY_PARAMS = frozenset(['fbclid', 'gclid', 'mc_cid', 'mc_eid', 'ref', 'ref_src', 'igshid', 'mkt_tok'])
+
+# Description sanitizing rules
+REMOVED_DESCRIPTION_TAGS = frozenset(['script', 'style', 'noscript', 'iframe', 'object', 'embed', 'form', 'input'])
+ALLOWED_DESCRIPTION_TAGS = frozenset(['br', 'p', 'b', 'i', 'em', 'strong', 'a', 'ul', 'ol', 'li', 'blockquote', 'code', 'pre', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'span', 'div'])
 
 
 @dataclass
@@ -38,55 +170,1494 @@ class FeedStats:
     successful: int = 0
     failed: int = 0
     retried: int = 0
+    not_modified: int = 0
+    unchanged: int = 0
+    throttled: int = 0
+    short_circuited: int = 0
+    rate_limit_wait: float = 0.0
+    connections_opened: int = 0
+    connections_reused: int = 0
+    tripped_hosts: List[str] = field(default_factory=list)
     failed_feeds: List[str] = field(default_factory=list)
+    succeeded_urls: List[str] = field(default_factory=list)
+    failed_urls: List[str] = field(default_factory=list)
+    feed_metrics: Dict[str, Dict[str, Any]] = field(default_factory=dict)
 
     def record_success(self, url: str) -> None:
         self.successful += 1
+        self.succeeded_urls.append(url)
 
     def record_failure(self, url: str, error: str) -> None:
         self.failed += 1
         self.failed_feeds.append(f"{url}: {error}")
+        self.failed_urls.append(url)
 
     def record_retry(self) -> None:
         self.retried += 1
 
+    def record_metrics(self, url: str, **metrics: Any) -> None:
+        """Merge timing and size measurements for a feed."""
+        self.feed_metrics.setdefault(url, {}).update(metrics)
+
+    def add_metric(self, url: str, name: str, value: float) -> None:
+        """Accumulate a measurement across retries."""
+        metrics = self.feed_metrics.setdefault(url, {})
+        metrics[name] = metrics.get(name, 0) + value
+
+    def record_not_modified(self) -> None:
+        self.not_modified += 1
+
+    def record_unchanged(self) -> None:
+        self.unchanged += 1
+
+    def record_throttled(self) -> None:
+        self.throttled += 1
+
+    def record_short_circuit(self, url: str) -> None:
+        self.short_circuited += 1
+        self.record_failure(url, "circuit breaker open for host")
+
+    def record_trip(self, host: str) -> None:
+        self.tripped_hosts.append(host)
+
+    def record_rate_limit_wait(self, seconds: float) -> None:
+        self.rate_limit_wait += seconds
+
+    def record_connections(self, opened: int, reused: int) -> None:
+        self.connections_opened += opened
+        self.connections_reused += reused
+
     def log_summary(self) -> None:
         logger.info(f"Feed fetch summary: {self.successful}/{self.total} successful, {self.failed} failed, {self.retried} retries")
+        truncated = sum(1 for metrics in self.feed_metrics.values() if metrics.get('truncated'))
+        logger.info(f"Cache summary: {self.not_modified} not modified (304), {self.unchanged} unchanged bodies, "
+                    f"{truncated} downloads stopped at the retention window")
+        if self.throttled or self.short_circuited or self.rate_limit_wait:
+            logger.info(f"Rate limiting: {self.throttled} throttled responses, {self.rate_limit_wait:.1f}s waited, "
+                        f"{self.short_circuited} feeds skipped by the circuit breaker")
+        if self.connections_opened or self.connections_reused:
+            requests_sent = self.connections_opened + self.connections_reused
+            logger.info(f"Connections: {self.connections_opened} opened, {self.connections_reused} requests on reused "
+                        f"connections ({self.connections_reused / requests_sent:.0%})")
+        if self.tripped_hosts:
+            logger.warning(f"Circuit breaker tripped for: {', '.join(self.tripped_hosts)}")
         if self.failed_feeds:
             logger.warning(f"Failed feeds ({len(self.failed_feeds)}):")
             for feed_error in self.failed_feeds[:10]:  # Limit output
                 logger.warning(f"  - {feed_error}")
             if len(self.failed_feeds) > 10:
                 logger.warning(f"  ... and {len(self.failed_feeds) - 10} more")
+        slowest = sorted(self.feed_metrics.items(), key=lambda kv: kv[1].get('total_time', 0), reverse=True)[:5]
+        if slowest:
+            logger.info("Slowest feeds: " + ', '.join(f"{url} ({m.get('total_time', 0):.2f}s)" for url, m in slowest))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'total': self.total,
+            'successful': self.successful,
+            'failed': self.failed,
+            'retried': self.retried,
+            'not_modified': self.not_modified,
+            'unchanged': self.unchanged,
+            'throttled': self.throttled,
+            'short_circuited': self.short_circuited,
+            'rate_limit_wait': self.rate_limit_wait,
+            'tripped_hosts': self.tripped_hosts,
+            'connections_opened': self.connections_opened,
+            'connections_reused': self.connections_reused,
+            'failed_feeds': self.failed_feeds,
+            'feeds': self.feed_metrics,
+        }
+
+
+class RunReport:
+    """Per-phase timings for one run, written as a machine-readable JSON report."""
+
+    def __init__(self):
+        self.started_at = datetime.now(pytz.utc)
+        self._start = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0) + time.perf_counter() - start
+
+    def write(self, stats: Optional[FeedStats], item_count: int, path: str = RUN_REPORT_PATH) -> None:
+        report = {
+            'started_at': self.started_at.isoformat(),
+            'duration': time.perf_counter() - self._start,
+            'phases': self.phases,
+            'items': item_count,
+            'fetch': stats.to_dict() if stats else None,
+        }
+        _save_json_file(path, report)
+        logger.info("Phase timings: " + ', '.join(f"{name} {seconds:.2f}s" for name, seconds in self.phases.items()))
+
+
+def _load_json_file(path: str, default: Any) -> Any:
+    """Load a JSON state file, returning default if it is missing or unreadable."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+    except (IOError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable state file {path}: {e}")
+        return default
+
+
+def _save_json_file(path: str, data: Any) -> None:
+    """Atomically write a JSON state file."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except IOError as e:
+        logger.error(f"Could not write state file {path}: {e}")
+
+
+def _file_digest(path: str) -> Optional[str]:
+    """Return the SHA-256 of a file's contents, or None if it does not exist."""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+_encode_json = json.JSONEncoder(separators=(',', ':'), default=_json_default).encode
+
+
+_encode_string = json.encoder.encode_basestring_ascii
+
+
+def _encode_value(value: Any) -> str:
+    return _encode_string(value) if value.__class__ is str else _encode_json(value)
+
+
+class FeedItem:
+    """One feed item.
+
+    Slotted to keep thousands of merged items small: published is stored as UTC epoch
+    seconds (and doubles as the sort key) and feed titles are interned, so items from the
+    same feed share one string.
+    """
+
+    __slots__ = ('id', 'title', 'link', 'published', 'thumbnail', 'feed_title', 'video_id', 'description', 'sources')
+
+    def __init__(self, id: str, title: str, link: str, published: int, thumbnail: str, feed_title: str,
+                 video_id: Optional[str], description: str):
+        self.id = id
+        self.title = title
+        self.link = link
+        self.published = published
+        self.thumbnail = thumbnail
+        self.feed_title = sys.intern(feed_title)
+        self.video_id = video_id
+        self.description = description
+        self.sources: Optional[List[str]] = None  # other feeds this item was merged from
+
+    def merge(self, duplicate: 'FeedItem') -> None:
+        """Fold a copy of this item from another feed into it."""
+        sources = self.sources or []
+        for title in [duplicate.feed_title] + (duplicate.sources or []):
+            if title and title != self.feed_title and title not in sources:
+                sources.append(title)
+        self.sources = sources or None
+        self.thumbnail = self.thumbnail or duplicate.thumbnail
+        self.video_id = self.video_id or duplicate.video_id
+        self.description = self.description or duplicate.description
+
+    def to_row(self) -> List[Any]:
+        """Return the item as a JSON-safe list, the format used by the caches."""
+        return [self.id, self.title, self.link, self.published, self.thumbnail, self.feed_title,
+                self.video_id, self.description]
+
+    @classmethod
+    def from_row(cls, row: Any) -> 'FeedItem':
+        """Restore an item from to_row(), or from the dict format used by older caches."""
+        if isinstance(row, dict):
+            published = int(datetime.fromisoformat(row['published']).timestamp())
+            return cls(row['id'], row['title'], row['link'], published, row['thumbnail'], row['feed_title'],
+                       row['video_id'], row['description'])
+        return cls(*row)
+
+    def to_json(self, published: str, feed: Optional[int] = None, sources: Optional[List[Any]] = None) -> str:
+        """Encode the item as the client expects it, given published as a local ISO 8601 string.
+
+        With feed, feed_title is replaced by a trailing "feed" index into the payload's feed table.
+        sources, if given, is appended as the list of other feeds (titles or feed table indexes).
+        """
+        head = (f'{{"id":{_encode_value(self.id)},"title":{_encode_value(self.title)},'
+                f'"link":{_encode_value(self.link)},"published":"{published}",'
+                f'"thumbnail":{_encode_value(self.thumbnail)},')
+        tail = f'"video_id":{_encode_value(self.video_id)},"description":{_encode_value(self.description)}'
+        if sources:
+            tail += f',"sources":{_encode_json(sources)}'
+        if feed is None:
+            return f'{head}"feed_title":{_encode_value(self.feed_title)},{tail}}}'
+        return f'{head}{tail},"feed":{feed}}}'
+
+
+class _LocalTimeFormatter:
+    """Format epoch seconds like datetime.isoformat() in a timezone, caching UTC offsets per hour."""
+
+    def __init__(self, tz: Any):
+        self.tz = tz
+        self._hours: Dict[int, Optional[Tuple[int, str]]] = {}
+
+    def _offset(self, hour: int) -> Optional[Tuple[int, str]]:
+        start = datetime.fromtimestamp(hour * 3600, self.tz)
+        end = datetime.fromtimestamp(hour * 3600 + 3599, self.tz)
+        if start.utcoffset() != end.utcoffset():
+            return None  # offset changes within this hour; format each timestamp exactly
+        return int(start.utcoffset().total_seconds()), start.isoformat()[19:]
+
+    def __call__(self, timestamp: int) -> str:
+        hour = timestamp // 3600
+        if hour not in self._hours:
+            self._hours[hour] = self._offset(hour)
+        cached = self._hours[hour]
+        if cached is None:
+            return datetime.fromtimestamp(timestamp, self.tz).isoformat()
+        offset, suffix = cached
+        return '%04d-%02d-%02dT%02d:%02d:%02d' % time.gmtime(timestamp + offset)[:6] + suffix
+
+
+def _iter_items_json(items: Iterable[FeedItem], tz: Any, feed_table: bool = False) -> Iterator[str]:
+    """Yield compact JSON for items without building intermediate dicts.
+
+    With feed_table, the payload becomes {"items": [...], "feeds": [...]} and each
+    item's feed_title is replaced by a "feed" index into the feeds list.
+    """
+    local_time = _LocalTimeFormatter(tz)
+    feed_index: Dict[str, int] = {}
+    yield '{"items":[' if feed_table else '['
+    for n, item in enumerate(items):
+        feed = feed_index.setdefault(item.feed_title, len(feed_index)) if feed_table else None
+        sources = item.sources
+        if sources and feed_table:
+            sources = [feed_index.setdefault(title, len(feed_index)) for title in sources]
+        item_json = item.to_json(local_time(item.published), feed, sources)
+        yield item_json if n == 0 else ',' + item_json
+    if feed_table:
+        yield '],"feeds":' + _encode_json(list(feed_index)) + '}'
+    else:
+        yield ']'
+
+
+def _merge_newest(runs: Iterable[Iterable[Tuple[float, Any]]], max_items: int = 0, max_per_feed: int = 0) -> List[Any]:
+    """Merge newest-first runs of (published, value) pairs into one newest-first list of values.
+
+    Runs are consumed one after another, so they can come straight from a cursor. Without
+    max_items the capped runs are k-way merged; with it, a min-heap holds only the newest
+    max_items values seen so far, and each run is abandoned once it falls behind the heap.
+    """
+    if not max_items:
+        capped = [list(islice(run, max_per_feed) if max_per_feed else run) for run in runs]
+        return [value for _, value in heapq.merge(*capped, key=itemgetter(0), reverse=True)]
+
+    heap: List[Tuple[float, int, Any]] = []
+    sequence = 0
+    for run in runs:
+        for published, value in (islice(run, max_per_feed) if max_per_feed else run):
+            sequence += 1
+            if len(heap) < max_items:
+                heapq.heappush(heap, (published, -sequence, value))
+            elif published > heap[0][0]:
+                heapq.heapreplace(heap, (published, -sequence, value))
+            else:
+                break  # the rest of this run is older still
+    heap.sort(reverse=True)
+    return [value for _, _, value in heap]
+
+
+def _normalize_link(link: str) -> str:
+    """Reduce a link to the form used to spot the same article in several feeds.
+
+    Scheme, "www.", default ports, fragments, trailing slashes and tracking parameters are dropped,
+    and the remaining query parameters are sorted.
+    """
+    try:
+        parts = urlsplit(link.strip())
+        port = parts.port
+    except ValueError:
+        return link.strip()
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if port and port not in (80, 443):
+        host = f"{host}:{port}"
+    params = sorted(param for param in parts.query.split('&')
+                    if param and not param.startswith('utm_') and param.split('=', 1)[0] not in TRACKING_QUERY_PARAMS)
+    normalized = host + parts.path.rstrip('/')
+    return f"{normalized}?{'&'.join(params)}" if params else normalized
+
+
+class DuplicateIndex:
+    """Hash indexes on item ID and normalized link, plus optional near-duplicate title matching.
+
+    Titles are compared as sets of word pairs. Only a prefix of each set (in a fixed global order)
+    is indexed: two sets with Jaccard similarity >= threshold always share a token there, so
+    candidates are found exactly and then confirmed with the full Jaccard similarity. Word pairs
+    shared by more than MAX_POSTINGS titles stop being indexed, which bounds the work per item.
+    """
+
+    MIN_TITLE_WORDS = 4
+    MAX_POSTINGS = 64
+
+    def __init__(self, titles: bool = DEDUPE_TITLES, threshold: float = DEDUPE_TITLE_THRESHOLD):
+        self.titles = titles
+        self.threshold = threshold
+        self.by_id: Dict[str, FeedItem] = {}
+        self.by_link: Dict[str, FeedItem] = {}
+        self.by_shingle: Dict[str, List[Tuple[FeedItem, frozenset]]] = {}
+
+    @classmethod
+    def title_shingles(cls, title: str) -> Optional[frozenset]:
+        words = re.findall(r'\w+', title.lower())
+        if len(words) < cls.MIN_TITLE_WORDS:
+            return None  # too short to tell a repost from a coincidence
+        return frozenset(f"{a} {b}" for a, b in zip(words, words[1:]))
+
+    def _prefix(self, shingles: frozenset) -> List[str]:
+        ordered = sorted(shingles, key=lambda shingle: (zlib.crc32(shingle.encode('utf-8')), shingle))
+        return ordered[:len(ordered) - math.ceil(self.threshold * len(ordered) - 1e-9) + 1]
+
+    def add(self, item: FeedItem) -> Optional[FeedItem]:
+        """Index item and return None, or return the already indexed item it duplicates."""
+        link = _normalize_link(item.link) if item.link else None
+        original = self.by_id.get(item.id) or (self.by_link.get(link) if link else None)
+
+        shingles = prefix = None
+        if original is None and self.titles:
+            shingles = self.title_shingles(item.title)
+            if shingles:
+                prefix = self._prefix(shingles)
+                original = self._similar_title(item, shingles, prefix)
+
+        target = original or item
+        self.by_id.setdefault(item.id, target)
+        if link:
+            self.by_link.setdefault(link, target)
+        if original is None and prefix:
+            for shingle in prefix:
+                postings = self.by_shingle.setdefault(shingle, [])
+                if len(postings) < self.MAX_POSTINGS:
+                    postings.append((item, shingles))
+        return original
+
+    def _similar_title(self, item: FeedItem, shingles: frozenset, prefix: List[str]) -> Optional[FeedItem]:
+        checked = set()
+        for shingle in prefix:
+            for candidate, other in self.by_shingle.get(shingle, ()):
+                if id(candidate) in checked or candidate.feed_title == item.feed_title:
+                    continue
+                checked.add(id(candidate))
+                if len(shingles & other) / len(shingles | other) >= self.threshold:
+                    return candidate
+        return None
+
+
+def _write_precompressed(path: str, data: bytes) -> None:
+    """Write .gz and, if brotli is available, .br siblings of a generated file."""
+    with open(f"{path}.gz", 'wb') as f:
+        f.write(gzip.compress(data, compresslevel=9, mtime=0))
+    try:
+        import brotli
+    except ImportError:
+        return
+    with open(f"{path}.br", 'wb') as f:
+        f.write(brotli.compress(data))
+
+
+@dataclass
+class ParsedFeed:
+    """Items parsed from one feed body, in-process or in a parse worker."""
+    items: Optional[List[FeedItem]]
+    entries: int = 0
+    error: Optional[str] = None
+    parse_time: float = 0.0
+    process_time: float = 0.0
+    memo_entries: Dict[str, List[str]] = field(default_factory=dict)
+    memo_hits: int = 0
+    memo_misses: int = 0
+    sources: Dict[str, str] = field(default_factory=dict)  # item ID -> _entry_source_key of its entry
+
+
+class FeedCache:
+    """Persistent per-URL cache of HTTP validators and last parsed items."""
+
+    def __init__(self, path: str = FEED_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = _load_json_file(path, {})
+        logger.info(f"Loaded feed cache with {len(self.entries)} entries from {path}")
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Return If-None-Match/If-Modified-Since headers for a cached URL."""
+        entry = self.entries.get(url)
+        if not entry or 'items' not in entry:
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def content_hash(self, url: str) -> Optional[str]:
+        entry = self.entries.get(url)
+        return entry.get('content_hash') if entry else None
+
+    def get_items(self, url: str) -> Optional[List[FeedItem]]:
+        """Return cached items for a URL, or None if nothing is cached."""
+        entry = self.entries.get(url)
+        if not entry or 'items' not in entry:
+            return None
+        return [FeedItem.from_row(row) for row in entry['items']]
+
+    def store(self, url: str, headers: Mapping[str, str], body_hash: str, items: List[FeedItem]) -> None:
+        """Record validators and parsed items for a successful fetch."""
+        entry = {
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'content_hash': body_hash,
+            'items': [item.to_row() for item in items],
+        }
+        with self._lock:
+            self.entries[url] = entry
+
+    def prune(self, urls: List[str]) -> None:
+        """Drop entries for feeds no longer listed."""
+        keep = set(urls)
+        with self._lock:
+            self.entries = {url: entry for url, entry in self.entries.items() if url in keep}
+
+    def save(self) -> None:
+        with self._lock:
+            _save_json_file(self.path, self.entries)
+        logger.info(f"Saved feed cache with {len(self.entries)} entries to {self.path}")
+
+
+class ItemStore:
+    """Persistent SQLite store of processed items, merged incrementally on each run."""
+
+    def __init__(self, path: str = ITEM_STORE_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        # Stores from before items were keyed per feed held each ID once; move them to the new table
+        schema = self.conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'items'").fetchone()
+        migrate = schema is not None and 'PRIMARY KEY (feed_url, id)' not in schema[0]
+        if migrate:
+            self.conn.executescript("""
+                ALTER TABLE items RENAME TO items_by_id;
+                DROP INDEX IF EXISTS items_published;
+                DROP INDEX IF EXISTS items_feed_url;
+                DROP INDEX IF EXISTS items_feed_published;
+            """)
+        # An entry listed by several feeds is stored once per feed; pages merge the copies.
+        # source is a hash of the raw entry fields the stored description and thumbnail came from.
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS items (
+                id TEXT NOT NULL,
+                feed_url TEXT NOT NULL,
+                published REAL NOT NULL,
+                data TEXT NOT NULL,
+                source TEXT,
+                PRIMARY KEY (feed_url, id)
+            );
+            CREATE INDEX IF NOT EXISTS items_published ON items (published);
+            CREATE INDEX IF NOT EXISTS items_feed_published ON items (feed_url, published);
+        """)
+        if 'source' not in [column[1] for column in self.conn.execute('PRAGMA table_info(items)')]:
+            self.conn.execute('ALTER TABLE items ADD COLUMN source TEXT')
+        if migrate:
+            self.conn.executescript("""
+                INSERT OR IGNORE INTO items (id, feed_url, published, data)
+                    SELECT id, feed_url, published, data FROM items_by_id;
+                DROP TABLE items_by_id;
+            """)
+            logger.info(f"Migrated {path} to per-feed item keys")
+
+    def feed_entries(self, feed_url: str) -> Dict[str, Tuple[Optional[str], FeedItem]]:
+        """Return a feed's stored items by ID, each with the source key it was built from."""
+        with self._lock:
+            rows = self.conn.execute('SELECT id, source, data FROM items WHERE feed_url = ?', (feed_url,)).fetchall()
+        return {item_id: (source, FeedItem.from_row(json.loads(data))) for item_id, source, data in rows}
+
+    def upsert(self, feed_url: str, items: List[FeedItem], sources: Optional[Mapping[str, str]] = None) -> None:
+        """Insert or replace items fetched from a feed; items without an entry in sources keep their stored one."""
+        sources = sources or {}
+        rows = [
+            (item.id, feed_url, item.published, _encode_json(item.to_row()), sources.get(item.id))
+            for item in items
+        ]
+        with self._lock:
+            self.conn.executemany("""
+                INSERT INTO items (id, feed_url, published, data, source) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (feed_url, id) DO UPDATE SET
+                    published = excluded.published, data = excluded.data,
+                    source = COALESCE(excluded.source, items.source)
+            """, rows)
+
+    def evict(self, cutoff_time: datetime, feed_urls: List[str],
+              feed_cutoffs: Optional[Mapping[str, datetime]] = None) -> int:
+        """Drop items older than cutoff_time, or their feed's entry in feed_cutoffs, or of feeds no longer listed."""
+        with self._lock:
+            expired = self.conn.execute('DELETE FROM items WHERE published < ?', (cutoff_time.timestamp(),)).rowcount
+            for feed_url, feed_cutoff in (feed_cutoffs or {}).items():
+                expired += self.conn.execute('DELETE FROM items WHERE feed_url = ? AND published < ?',
+                                             (feed_url, feed_cutoff.timestamp())).rowcount
+            self.conn.execute('CREATE TEMP TABLE IF NOT EXISTS current_feeds (url TEXT PRIMARY KEY)')
+            self.conn.execute('DELETE FROM current_feeds')
+            self.conn.executemany('INSERT OR IGNORE INTO current_feeds (url) VALUES (?)', [(url,) for url in feed_urls])
+            removed = self.conn.execute(
+                'DELETE FROM items WHERE feed_url NOT IN (SELECT url FROM current_feeds)').rowcount
+        logger.info(f"Evicted {expired} expired items and {removed} items from removed feeds")
+        return expired + removed
+
+    def feed_published_times(self) -> Dict[str, List[float]]:
+        """Return each feed's stored item publish times as sorted epoch seconds."""
+        with self._lock:
+            rows = self.conn.execute('SELECT feed_url, published FROM items ORDER BY published').fetchall()
+        times: Dict[str, List[float]] = {}
+        for feed_url, published in rows:
+            times.setdefault(feed_url, []).append(published)
+        return times
+
+    def oldest_published(self) -> Dict[str, float]:
+        """Return the publish time of each feed's oldest stored item as epoch seconds."""
+        with self._lock:
+            return dict(self.conn.execute('SELECT feed_url, MIN(published) FROM items GROUP BY feed_url'))
+
+    def load_items(self, max_items: int = 0, max_per_feed: int = 0, feed_urls: Optional[Collection[str]] = None,
+                   feed_caps: Optional[Mapping[str, int]] = None, feed_cutoffs: Optional[Mapping[str, float]] = None,
+                   feed_titles: Optional[Mapping[str, str]] = None) -> List[FeedItem]:
+        """Return stored items newest first, optionally only the newest max_items and max_per_feed per feed.
+
+        With feed_urls, only items of those feeds are returned. feed_caps limits single feeds further,
+        feed_cutoffs drops a feed's items published before the given epoch seconds, and feed_titles
+        renames feeds.
+        """
+        feed_caps = feed_caps or {}
+        feed_cutoffs = feed_cutoffs or {}
+        feed_titles = feed_titles or {}
+
+        def feed_run(feed_url: str, run: Iterable[Tuple[str, float, str]]) -> Iterator[Tuple[float, Tuple[str, str]]]:
+            pairs = ((published, (feed_url, data)) for _, published, data in run)
+            cutoff = feed_cutoffs.get(feed_url)
+            if cutoff is not None:
+                pairs = takewhile(lambda pair: pair[0] >= cutoff, pairs)
+            return islice(pairs, feed_caps.get(feed_url))
+
+        with self._lock:
+            # Walks the (feed_url, published) index: one newest-first run per feed, no global sort
+            rows = self.conn.execute(
+                'SELECT feed_url, published, data FROM items ORDER BY feed_url DESC, published DESC')
+            runs = (feed_run(feed_url, run) for feed_url, run in groupby(rows, key=itemgetter(0))
+                    if feed_urls is None or feed_url in feed_urls)
+            kept = _merge_newest(runs, max_items, max_per_feed)
+        items = []
+        for feed_url, data in kept:
+            item = FeedItem.from_row(json.loads(data))
+            if feed_url in feed_titles:
+                item.feed_title = sys.intern(feed_titles[feed_url])
+            items.append(item)
+        return items
+
+    def commit(self) -> None:
+        with self._lock:
+            self.conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.commit()
+            self.conn.close()
+
+
+class FeedScheduler:
+    """Persistent per-feed poll schedule driven by posting cadence and fetch outcomes."""
+
+    def __init__(self, path: str = FEED_SCHEDULE_PATH, min_interval: float = SCHEDULE_MIN_INTERVAL,
+                 grace: float = SCHEDULE_GRACE):
+        self.path = path
+        self.min_interval = min_interval
+        self.grace = grace
+        self.state: Dict[str, Dict[str, Any]] = _load_json_file(path, {})
+
+    def due_feeds(self, urls: List[str], now: float) -> List[str]:
+        """Return the feeds whose next poll time has arrived; unknown feeds are always due."""
+        return [url for url in urls if self.state.get(url, {}).get('next_due', 0) <= now + self.grace]
+
+    def update(self, stats: FeedStats, published_times: Dict[str, List[float]], now: float) -> None:
+        """Record this run's outcomes and compute each fetched feed's next due time."""
+        for url in stats.failed_urls:
+            entry = self.state.setdefault(url, {})
+            entry['failures'] = entry.get('failures', 0) + 1
+            entry['last_fetch'] = now
+            backoff = self.min_interval * (2 ** (entry['failures'] - 1))
+            entry['next_due'] = now + min(backoff, SCHEDULE_MAX_FAILURE_BACKOFF)
+
+        for url in stats.succeeded_urls:
+            entry = self.state.setdefault(url, {})
+            entry['failures'] = 0
+            entry['last_fetch'] = now
+
+            times = published_times.get(url, [])
+            newest = times[-1] if times else 0
+            if newest > entry.get('newest', 0):
+                entry['idle_runs'] = 0
+            else:
+                entry['idle_runs'] = entry.get('idle_runs', 0) + 1
+            entry['newest'] = max(newest, entry.get('newest', 0))
+
+            # Typical gap between posts, from items still in the retention window
+            gaps = sorted(b - a for a, b in zip(times, times[1:]) if b > a)
+            cadence = gaps[len(gaps) // 2] if gaps else SCHEDULE_MAX_INTERVAL / SCHEDULE_CADENCE_FACTOR
+            entry['cadence'] = cadence
+
+            # Back off further for each run that brought nothing new
+            interval = cadence * SCHEDULE_CADENCE_FACTOR * (2 ** min(entry['idle_runs'], 4))
+            entry['next_due'] = now + max(self.min_interval, min(interval, SCHEDULE_MAX_INTERVAL))
+
+    def prune(self, urls: List[str]) -> None:
+        keep = set(urls)
+        self.state = {url: entry for url, entry in self.state.items() if url in keep}
+
+    def save(self) -> None:
+        _save_json_file(self.path, self.state)
+
+
+class DescriptionMemo:
+    """Persistent LRU memo of cleaned descriptions and thumbnails, keyed by a hash of the raw entry HTML."""
+
+    def __init__(self, path: str = DESCRIPTION_MEMO_PATH, max_entries: int = DESCRIPTION_MEMO_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self.entries: 'OrderedDict[str, List[str]]' = OrderedDict(_load_json_file(path, {}))
+        self.hits = 0
+        self.misses = 0
+        # Parse workers record their new entries here so the parent process can merge them
+        self.added: Optional[Dict[str, List[str]]] = None
+
+    @staticmethod
+    def key_for(*parts: str) -> str:
+        digest = hashlib.sha1()
+        for part in parts:
+            digest.update(part.encode('utf-8', 'surrogatepass'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[str, str]]:
+        """Return (description, thumbnail) for key, marking it recently used."""
+        with self._lock:
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+        return value[0], value[1]
+
+    def put(self, key: str, description: str, thumbnail: str) -> None:
+        with self._lock:
+            self.entries[key] = [description, thumbnail]
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            if self.added is not None:
+                self.added[key] = [description, thumbnail]
+
+    def merge(self, entries: Mapping[str, List[str]], hits: int = 0, misses: int = 0) -> None:
+        """Add entries and lookup counts collected by a parse worker."""
+        for key, (description, thumbnail) in entries.items():
+            self.put(key, description, thumbnail)
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def save(self) -> None:
+        with self._lock:
+            _save_json_file(self.path, self.entries)
+        logger.info(f"Description memo: {self.hits} hits, {self.misses} misses, {len(self.entries)} entries")
+
+
+_SEARCH_TAG_RE = re.compile(r'<[^>]*>')
+_SEARCH_TOKEN_RE = re.compile(r'\w+')
+
+
+def _search_tokens(item: FeedItem) -> List[str]:
+    """Return the sorted, distinct lowercase words of an item's title, feed title and description text."""
+    text = ' '.join((item.title, item.feed_title, html.unescape(_SEARCH_TAG_RE.sub(' ', item.description or ''))))
+    return sorted({token for token in _SEARCH_TOKEN_RE.findall(text.lower()) if len(token) >= SEARCH_MIN_TOKEN_LENGTH})
+
+
+class SearchTokens:
+    """Persistent per-item search tokens, so each run only tokenizes items that are new or changed."""
+
+    def __init__(self, path: str = SEARCH_TOKENS_PATH):
+        self.path = path
+        # item ID -> [CRC of the indexed text, tokens]
+        self.entries: Dict[str, List[Any]] = _load_json_file(path, {})
+        self.used: set = set()
+        self.tokenized = 0
+
+    def tokens(self, item: FeedItem) -> List[str]:
+        text = '\0'.join((item.title, item.feed_title, item.description or ''))
+        crc = zlib.crc32(text.encode('utf-8', 'surrogatepass'))
+        entry = self.entries.get(item.id)
+        if entry is None or entry[0] != crc:
+            entry = self.entries[item.id] = [crc, _search_tokens(item)]
+            self.tokenized += 1
+        self.used.add(item.id)
+        return entry[1]
+
+    def save(self) -> None:
+        """Save the tokens used since the last save; items that left the pages are dropped."""
+        self.entries = {item_id: entry for item_id, entry in self.entries.items() if item_id in self.used}
+        self.used = set()
+        _save_json_file(self.path, self.entries)
+        logger.info(f"Search index: tokenized {self.tokenized} items, {len(self.entries)} cached")
+        self.tokenized = 0
+
+
+class ThumbnailCache:
+    """Content-addressed store of downscaled thumbnails, indexed by a hash of the source URL."""
+
+    def __init__(self, path: str = THUMBNAIL_INDEX_PATH, directory: str = THUMBNAIL_CACHE_DIR):
+        self.path = path
+        self.directory = directory
+        self._lock = threading.Lock()
+        # URL hash -> [file name, or None if the image could not be cached, time of the attempt]
+        self.entries: Dict[str, List[Any]] = _load_json_file(path, {})
+        self.used: set = set()
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        return hashlib.sha1(url.encode('utf-8', 'surrogatepass')).hexdigest()
+
+    def known(self, url: str, now: float) -> bool:
+        """Whether url is cached, or failed recently enough not to be tried again."""
+        key = self.key_for(url)
+        entry = self.entries.get(key)
+        if entry is None:
+            return False
+        file_name, checked_at = entry
+        if file_name is None:
+            return now - checked_at < THUMBNAIL_RETRY_AFTER
+        return os.path.exists(os.path.join(self.directory, file_name))
+
+    def file_for(self, url: str) -> Optional[str]:
+        """Return the cached file name for url, marking it as on a page."""
+        key = self.key_for(url)
+        self.used.add(key)
+        entry = self.entries.get(key)
+        return entry[0] if entry else None
+
+    def store(self, url: str, file_name: Optional[str], now: float) -> None:
+        with self._lock:
+            self.entries[self.key_for(url)] = [file_name, now]
+
+    def save(self, output_dir: str = THUMBNAIL_DIR) -> None:
+        """Drop thumbnails no page used since the last save, and copy the rest to output_dir."""
+        self.entries = {key: entry for key, entry in self.entries.items() if key in self.used}
+        self.used = set()
+        files = {entry[0] for entry in self.entries.values() if entry[0]}
+        for directory in (self.directory, output_dir):
+            if os.path.isdir(directory):
+                for file_name in os.listdir(directory):
+                    if file_name not in files:
+                        os.remove(os.path.join(directory, file_name))
+        os.makedirs(output_dir, exist_ok=True)
+        for file_name in files:
+            target = os.path.join(output_dir, file_name)
+            if not os.path.exists(target):
+                try:
+                    os.link(os.path.join(self.directory, file_name), target)
+                except OSError:
+                    shutil.copyfile(os.path.join(self.directory, file_name), target)
+        _save_json_file(self.path, self.entries)
+        logger.info(f"Thumbnail cache: {len(files)} thumbnails on the page")
+
+
+def _parse_bool(value: str) -> bool:
+    if value.lower() in ('1', 'yes', 'true', 'on'):
+        return True
+    if value.lower() in ('0', 'no', 'false', 'off'):
+        return False
+    raise ValueError(f"not a yes/no value: {value}")
+
+
+def _parse_positive_int(value: str) -> int:
+    number = int(value)
+    if number <= 0:
+        raise ValueError(f"not a positive number: {value}")
+    return number
+
+
+# Per-feed options, written after the URL in feeds.txt: "<url> retention=2 max_items=20"
+FEED_OPTIONS: Dict[str, Callable[[str], Any]] = {
+    'shorts': _parse_bool,  # YouTube: include Shorts (default INCLUDE_YOUTUBE_SHORTS)
+    'retention': _parse_positive_int,  # days to keep items, at most ITEMS_RETENTION_DAYS
+    'max_items': _parse_positive_int,  # newest items of the feed kept on the page
+}
+
+
+def _parse_feed_line(line: str) -> Tuple[str, Dict[str, Any]]:
+    """Split a feeds.txt line into its URL and per-feed options."""
+    url, *words = line.split()
+    options: Dict[str, Any] = {}
+    for word in words:
+        name, _, value = word.partition('=')
+        parse = FEED_OPTIONS.get(name)
+        if parse is None:
+            logger.warning(f"Ignoring unknown option {word!r} for {url}")
+            continue
+        try:
+            options[name] = parse(value)
+        except ValueError as e:
+            logger.warning(f"Ignoring option {word!r} for {url}: {e}")
+    return url, options
+
+
+class FeedRegistry:
+    """Persistent compiled feed lists, keyed by path and valid while the file's content hash matches.
+
+    A compiled list holds the feed URLs to fetch (YouTube channels already resolved), their title
+    overrides and options, and the feeds grouped by host.
+    """
+
+    def __init__(self, path: str = FEED_REGISTRY_PATH):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = _load_json_file(path, {})
+
+    @staticmethod
+    def hash_for(file_path: str) -> Optional[str]:
+        digest = _file_digest(file_path)
+        if digest is None:
+            return None
+        return f"{FEED_REGISTRY_VERSION}:{int(INCLUDE_YOUTUBE_SHORTS)}:{digest}"
+
+    def get(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Return the compiled list for file_path if the file has not changed since it was compiled."""
+        entry = self.entries.get(file_path)
+        if entry and entry['hash'] == self.hash_for(file_path):
+            return entry
+        return None
+
+    def put(self, file_path: str, feeds: List[Dict[str, Any]]) -> Dict[str, Any]:
+        hosts: Dict[str, List[str]] = {}
+        for feed in feeds:
+            hosts.setdefault(urlparse(feed['url']).hostname or '', []).append(feed['url'])
+        entry = {'hash': self.hash_for(file_path), 'feeds': feeds, 'hosts': hosts}
+        self.entries[file_path] = entry
+        _save_json_file(self.path, self.entries)
+        return entry
+
+
+class YouTubeChannelCache:
+    """Persistent store of resolved YouTube channel IDs, keyed by handle, channel ID or URL."""
+
+    def __init__(self, path: str = YOUTUBE_CHANNEL_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = _load_json_file(path, {})
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        """Normalize a channel URL to a stable lookup key."""
+        match = re.search(r'youtube\.com/(@[\w.-]+)', url)
+        if match:
+            return match.group(1).lower()
+        match = re.search(r'(?:channel/|channel_id=)(UC[\w-]+)', url)
+        if match:
+            return match.group(1)
+        return url.strip().rstrip('/')
+
+    def get(self, url: str, allow_stale: bool = False) -> Optional[Dict[str, Any]]:
+        """Return a fresh entry for url, or None if missing or expired."""
+        entry = self.entries.get(self.key_for(url))
+        if not entry:
+            return None
+        if allow_stale:
+            return entry
+        age = time.time() - entry.get('resolved_at', 0)
+        if entry.get('channel_id'):
+            ttl = YOUTUBE_CHANNEL_CACHE_TTL_DAYS * 86400
+        else:
+            ttl = YOUTUBE_CHANNEL_FAILURE_TTL_HOURS * 3600
+        return entry if age < ttl else None
+
+    def store(self, url: str, channel_id: Optional[str], channel_name: Optional[str], strategy: Optional[str]) -> None:
+        """Record a resolution result; a missing channel_id is cached as a failure."""
+        entry = {
+            'channel_id': channel_id,
+            'channel_name': channel_name,
+            'strategy': strategy,
+            'resolved_at': time.time(),
+        }
+        with self._lock:
+            self.entries[self.key_for(url)] = entry
+
+    def save(self) -> None:
+        with self._lock:
+            _save_json_file(self.path, self.entries)
+
+
+class HostRateLimiter:
+    """Per-host token buckets shared by every fetch thread or task.
+
+    reserve() takes a token and returns how long the caller must wait before using it, so the
+    same limiter serves blocking threads and the event loop. A throttled host can be held back
+    until its Retry-After time with block().
+    """
+
+    def __init__(self, default_rate: Optional[float] = None, rates: Optional[Mapping[str, float]] = None,
+                 burst: Optional[int] = None):
+        self.default_rate = HOST_RATE_LIMIT if default_rate is None else default_rate
+        self.rates = HOST_RATE_LIMITS if rates is None else rates
+        self.burst = HOST_RATE_BURST if burst is None else burst
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, List[float]] = {}  # host -> [tokens, last refill]
+        self._blocked_until: Dict[str, float] = {}
+
+    def reserve(self, host: str) -> float:
+        """Take a token for host and return the seconds to wait before sending the request."""
+        rate = self.rates.get(host, self.default_rate)
+        now = time.monotonic()
+        with self._lock:
+            wait = max(0.0, self._blocked_until.get(host, 0) - now)
+            if rate <= 0:
+                return wait
+            bucket = self._buckets.setdefault(host, [float(self.burst), now])
+            bucket[0] = min(float(self.burst), bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            # Going negative queues the request behind the ones already waiting
+            bucket[0] -= 1
+            if bucket[0] < 0:
+                wait = max(wait, -bucket[0] / rate)
+        return wait
+
+    def block(self, host: str, seconds: float) -> None:
+        """Hold back every request to host for the next seconds."""
+        with self._lock:
+            until = time.monotonic() + seconds
+            self._blocked_until[host] = max(self._blocked_until.get(host, 0), until)
+
+
+class CircuitBreaker:
+    """Persistent per-host circuit breaker for hosts that keep throttling us.
+
+    After CIRCUIT_BREAKER_THRESHOLD consecutive throttled responses (or a Retry-After longer
+    than RETRY_AFTER_MAX) a host is open for CIRCUIT_BREAKER_COOLDOWN seconds, and its feeds
+    fail without a request. The failure count survives the cooldown, so the first throttled
+    response after it reopens the host at once; a success closes it.
+    """
+
+    def __init__(self, path: str = CIRCUIT_BREAKER_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.state: Dict[str, Dict[str, Any]] = _load_json_file(path, {})
+
+    def allow(self, host: str, now: float) -> bool:
+        """Return whether requests to host may be sent."""
+        return self.state.get(host, {}).get('open_until', 0) <= now
+
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            self.state.pop(host, None)
+
+    def record_throttled(self, host: str, now: float, retry_after: Optional[float] = None) -> bool:
+        """Count a throttled response; return True if this trips the breaker."""
+        with self._lock:
+            entry = self.state.setdefault(host, {'failures': 0, 'open_until': 0})
+            if entry['open_until'] > now:
+                return False  # already open; a request sent before it tripped
+            entry['failures'] += 1
+            if entry['failures'] < CIRCUIT_BREAKER_THRESHOLD and (retry_after or 0) <= RETRY_AFTER_MAX:
+                return False
+            entry['open_until'] = now + max(CIRCUIT_BREAKER_COOLDOWN, retry_after or 0)
+            entry['trips'] = entry.get('trips', 0) + 1
+        logger.warning(f"Circuit breaker open for {host} until "
+                       f"{datetime.fromtimestamp(entry['open_until'], pytz.utc).isoformat(timespec='seconds')}")
+        return True
+
+    def save(self) -> None:
+        with self._lock:
+            _save_json_file(self.path, self.state)
+
+
+def _retry_after(headers: Mapping[str, str], now: float) -> Optional[float]:
+    """Return the seconds a Retry-After header asks us to wait, if it has a usable value."""
+    value = (headers.get('Retry-After') or '').strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - now)
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter, so feeds that failed together do not retry together."""
+    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class _Http2Body:
+    """Response.raw stand-in that streams a decoded httpx response body to requests."""
+
+    def __init__(self, response: Any):
+        self._response = response
+
+    def stream(self, chunk_size: int, decode_content: bool = True) -> Iterator[bytes]:
+        import httpx
+        try:
+            yield from self._response.iter_bytes(chunk_size)
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(e)
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(e)
+
+    def close(self) -> None:
+        self._response.close()
+
+
+class _Http2Adapter:
+    """requests transport adapter (send/close) that sends requests through an httpx HTTP/2 client.
+
+    Mounted for HTTP2_HOSTS, so every fetch thread multiplexes over one connection per host
+    while retries, redirects and streaming keep going through the shared session.
+    """
+
+    def __init__(self, max_connections: int):
+        import httpx
+        self.client = httpx.Client(http2=True, limits=httpx.Limits(max_connections=max_connections))
+        self.requests = 0
+
+    def send(self, request: 'requests.PreparedRequest', stream: bool = False, timeout: Any = None,
+             verify: Any = True, cert: Any = None, proxies: Any = None) -> 'requests.Response':
+        import httpx
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        try:
+            sent = self.client.send(
+                self.client.build_request(request.method, request.url, headers=dict(request.headers),
+                                          content=request.body, timeout=httpx.Timeout(read, connect=connect)),
+                stream=True)
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(e, request=request)
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(e, request=request)
+        self.requests += 1
+
+        response = requests.Response()
+        response.status_code = sent.status_code
+        response.reason = sent.reason_phrase
+        response.headers = requests.structures.CaseInsensitiveDict(sent.headers.items())
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.raw = _Http2Body(sent)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self) -> None:
+        self.client.close()
+
+
+def _new_http_session() -> 'requests.Session':
+    """Build the session for the thread engine with keep-alive pools sized to the fetch concurrency.
+
+    Every fetch thread may hold a connection to the same host, so pools hold MAX_WORKERS
+    connections; hosts in HOST_CONNECTION_LIMITS get a blocking pool of their own size instead.
+    """
+    from urllib3.util.request import ACCEPT_ENCODING
+
+    session = requests.Session()
+    session.headers.update({'User-Agent': USER_AGENT, 'Accept-Encoding': ACCEPT_ENCODING})
+    adapter = requests.adapters.HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=MAX_WORKERS)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    for host, limit in HOST_CONNECTION_LIMITS.items():
+        host_adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=limit, pool_block=True)
+        session.mount(f'https://{host}/', host_adapter)
+        session.mount(f'http://{host}/', host_adapter)
+    if HTTP2_HOSTS:
+        try:
+            for host in HTTP2_HOSTS:
+                session.mount(f'https://{host}/', _Http2Adapter(HOST_CONNECTION_LIMITS.get(host, MAX_WORKERS)))
+        except ImportError:
+            logger.warning("httpx[http2] is not installed; fetching HTTP2_HOSTS over HTTP/1.1")
+    return session
+
+
+def _connection_counts(session: 'requests.Session') -> Tuple[int, int]:
+    """Return (requests sent, connections opened) so far over the session's connection pools."""
+    sent = opened = 0
+    for adapter in {id(adapter): adapter for adapter in session.adapters.values()}.values():
+        if isinstance(adapter, _Http2Adapter):
+            # Multiplexed: count one connection per host, the rest ride on it
+            sent += adapter.requests
+            opened += min(adapter.requests, 1)
+            continue
+        for key in adapter.poolmanager.pools.keys():
+            pool = adapter.poolmanager.pools.get(key)
+            if pool is not None:
+                sent += pool.num_requests
+                opened += pool.num_connections
+    return sent, opened
+
+
+class _DescriptionBudgetReached(Exception):
+    """Raised by _DescriptionSanitizer to stop parsing once the text budget is spent."""
+
+
+class _DescriptionSanitizer:
+    """lxml parser target that sanitizes description HTML in a single pass.
+
+    lxml delivers the same events BeautifulSoup builds its tree from, so this
+    reproduces what the soup-based cleaner serializes (sorted attributes,
+    collapsed whitespace-only strings, ``<br/>``) without building a tree.
+    Once more than ``max_len`` characters of text have been seen the output
+    can only be the truncated plain-text form, so parsing stops early.
+    """
+
+    ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+    PRESERVE_WHITESPACE_TAGS = frozenset(['pre', 'textarea'])
+    # Strings inside these are not plain NavigableStrings and are skipped by get_text()
+    STRING_CONTAINER_TAGS = frozenset(['rt', 'rp', 'template', 'script', 'style'])
+    MULTI_VALUED_ATTRIBUTES = frozenset(['accesskey', 'dropzone'])
+    MULTI_VALUED_LINK_ATTRIBUTES = frozenset(['rel', 'rev'])
+    NON_WHITESPACE_RE = re.compile(r'\S+')
+
+    def __init__(self, max_len: int = DESCRIPTION_MAX_LENGTH):
+        self.max_len = max_len
+        self.html: List[str] = []
+        self.strings: List[str] = []
+        self.text_len = 0
+        self.visible_len = 0
+        self.stack: List[Tuple[str, str]] = []
+        self.removed_depth = 0
+        self.preserve_depth = 0
+        self.container_depth = 0
+        self.pending: List[str] = []
+
+    @staticmethod
+    def escape(text: str) -> str:
+        return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+    def _flush(self) -> None:
+        if not self.pending:
+            return
+        text = ''.join(self.pending)
+        self.pending = []
+        if self.removed_depth:
+            return
+        if not self.preserve_depth and not text.strip(self.ASCII_SPACES):
+            text = '\n' if '\n' in text else ' '
+        self.strings.append(text)
+        self.html.append(self.escape(text))
+        if not self.container_depth:
+            self.text_len += len(text)
+            self.visible_len += len(text) - sum(1 for c in text if c.isspace())
+            if self.text_len > self.max_len and self.visible_len > self.max_len:
+                raise _DescriptionBudgetReached()
+
+    def _attributes(self, tag: str, attrib: Mapping[str, str]) -> str:
+        parts = []
+        for name, value in sorted(attrib.items()):
+            if name.startswith('on') or name in ('style', 'class', 'id'):
+                continue
+            if name in self.MULTI_VALUED_ATTRIBUTES or (tag == 'a' and name in self.MULTI_VALUED_LINK_ATTRIBUTES):
+                value = ' '.join(self.NON_WHITESPACE_RE.findall(value))
+            value = self.escape(value)
+            quote = '"'
+            if '"' in value:
+                if "'" in value:
+                    value = value.replace('"', '&quot;')
+                else:
+                    quote = "'"
+            parts.append(f' {name}={quote}{value}{quote}')
+        return ''.join(parts)
+
+    def start(self, tag: str, attrib: Mapping[str, str]) -> None:
+        self._flush()
+        if self.removed_depth or tag in REMOVED_DESCRIPTION_TAGS:
+            self.removed_depth += 1
+            mode = 'removed'
+        elif tag in ALLOWED_DESCRIPTION_TAGS:
+            if tag == 'br':
+                self.html.append(f'<br{self._attributes(tag, attrib)}/>')
+                mode = 'void'
+            else:
+                self.html.append(f'<{tag}{self._attributes(tag, attrib)}>')
+                mode = 'kept'
+        else:
+            mode = 'unwrapped'
+        if tag in self.PRESERVE_WHITESPACE_TAGS:
+            self.preserve_depth += 1
+        if tag in self.STRING_CONTAINER_TAGS:
+            self.container_depth += 1
+        self.stack.append((tag, mode))
+
+    def end(self, tag: str) -> None:
+        self._flush()
+        name, mode = self.stack.pop()
+        if mode == 'removed':
+            self.removed_depth -= 1
+        elif mode == 'kept':
+            self.html.append(f'</{name}>')
+        if name in self.PRESERVE_WHITESPACE_TAGS:
+            self.preserve_depth -= 1
+        if name in self.STRING_CONTAINER_TAGS:
+            self.container_depth -= 1
+
+    def data(self, data: str) -> None:
+        self.pending.append(data)
+
+    def comment(self, text: str) -> None:
+        self._flush()
+        if not self.removed_depth:
+            self.strings.append(text)
+            self.html.append(f'<!--{text}-->')
+
+    def pi(self, target: str, data: str) -> None:
+        self._flush()
+        if not self.removed_depth:
+            text = f'{target} {data}'
+            self.strings.append(text)
+            self.html.append(f'<?{text}>')
+
+    def doctype(self, name: Optional[str], pubid: Optional[str], system: Optional[str]) -> None:
+        self._flush()
+        if self.removed_depth:
+            return
+        text = name or ''
+        if pubid is not None:
+            text += f' PUBLIC "{pubid}"'
+            if system is not None:
+                text += f' "{system}"'
+        elif system is not None:
+            text += f' SYSTEM "{system}"'
+        self.strings.append(text)
+        self.html.append(f'<!DOCTYPE {text}>\n')
+
+    def close(self) -> None:
+        self._flush()
+
+    def result(self, stopped: bool) -> str:
+        """Return the cleaned, possibly truncated, description."""
+        max_len = self.max_len
+        if not stopped:
+            html = ''.join(self.html)
+
+            # Clean up whitespace while preserving paragraph breaks
+            html = re.sub(r'<br\s*/?>\s*</p>', '</p>', html)
+            html = re.sub(r'<p>\s*</p>', '', html)
+            html = re.sub(r'\s+', ' ', html)
+            html = html.strip()
+
+            if len(html) <= max_len or self.text_len <= max_len:
+                return html
+
+        # Truncate to plain text at a word boundary
+        text_parts = []
+        current_len = 0
+        for text in self.strings:
+            text_parts.append(text)
+            current_len += len(text)
+            if current_len >= max_len:
+                break
+
+        html = self.escape(''.join(text_parts))
+        if len(html) > max_len:
+            cutoff = html[:max_len]
+            last_space = cutoff.rfind(' ')
+            if last_space > max_len * 0.6:
+                html = html[:last_space] + '...'
+            else:
+                html = html[:max_len] + '...'
+        return html
+
+
+def _parse_feed_date(value: str) -> Optional[datetime]:
+    """Parse an RFC 822 (RSS) or ISO 8601 (Atom) date, assuming UTC when no offset is given."""
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        parsed = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=pytz.utc)
+
+
+class _FeedStreamReader:
+    """Incrementally parse an RSS/Atom body and stop once entries fall behind the retention cutoff.
+
+    Feeds are mostly newest-first, so after STREAM_STALE_ENTRIES consecutive stale entries the
+    rest of the body is not downloaded. The entries read so far are re-serialized into a
+    well-formed document for feedparser; bodies lxml cannot parse strictly are kept whole.
+    """
+
+    ENTRY_TAGS = frozenset(['item', 'entry'])
+    PUBLISHED_TAGS = frozenset(['pubDate', 'published', 'issued'])
+    UPDATED_TAGS = frozenset(['updated', 'modified', 'date'])
+
+    def __init__(self, cutoff_time: datetime, stale_limit: int = STREAM_STALE_ENTRIES):
+        self.cutoff_time = cutoff_time
+        self.stale_limit = stale_limit
+        self.bytes_read = 0
+        self.stopped = False
+        self._chunks: List[bytes] = []
+        # Bodies are untrusted: the truncated document must not carry anything feedparser would not resolve itself
+        self._parser: Optional[etree.XMLPullParser] = etree.XMLPullParser(
+            events=('start', 'end'), resolve_entities=False, no_network=True, huge_tree=False)
+        self._root = None
+        self._stale: List[Any] = []
+
+    def feed(self, chunk: bytes) -> bool:
+        """Consume a chunk; return False once the rest of the body can be skipped."""
+        self.bytes_read += len(chunk)
+        self._chunks.append(chunk)
+        if self._parser is None:
+            return True
+        try:
+            self._parser.feed(chunk)
+            for event, element in self._parser.read_events():
+                if self._root is None:
+                    self._root = element
+                if event == 'end' and etree.QName(element).localname in self.ENTRY_TAGS:
+                    if self._is_stale(element):
+                        self._stale.append(element)
+                        if len(self._stale) >= self.stale_limit:
+                            self.stopped = True
+                            return False
+                    else:
+                        self._stale = []
+        except etree.LxmlError:
+            # Not strict XML (HTML entities, broken markup): let feedparser handle the whole body
+            self._parser = None
+        return True
+
+    def _is_stale(self, element) -> bool:
+        published = updated = None
+        for child in element.iterchildren(tag=etree.Element):
+            name = etree.QName(child).localname
+            if name in self.PUBLISHED_TAGS and published is None:
+                published = child.text
+            elif name in self.UPDATED_TAGS and updated is None:
+                updated = child.text
+        parsed = _parse_feed_date(published or updated or '')
+        return parsed is not None and parsed < self.cutoff_time
+
+    def downloaded(self) -> bytes:
+        """Return the bytes read so far, as they arrived."""
+        return b''.join(self._chunks)
+
+    def content(self) -> bytes:
+        """Return the body to parse: the full download, or the truncated re-serialized document."""
+        if not self.stopped:
+            return self.downloaded()
+        # Drop the trailing stale entries and anything parsed after them
+        first_stale = self._stale[0]
+        parent = first_stale.getparent()
+        element = first_stale
+        while element is not None:
+            following = element.getnext()
+            parent.remove(element)
+            element = following
+        return etree.tostring(self._root, encoding='utf-8', xml_declaration=True)
 
 
 class FeedProcessor:
     """Main class for processing RSS feeds and YouTube channels."""
     
-    def __init__(self, timezone: str = TIMEZONE):
+    def __init__(self, timezone: str = TIMEZONE, parse_only: bool = False):
+        """parse_only builds just what _parse_feed needs (parse workers): no HTTP session, no item
+        store and no on-disk caches besides the description memo. Callers pass each feed's stored entries."""
         self.timezone = timezone
         self.local_tz = pytz.timezone(timezone)
         self.utc_now = datetime.now(pytz.utc)
-        self.session = requests.Session()
-        self.session.headers.update({'User-Agent': USER_AGENT})
         self.feed_title_overrides: Dict[str, str] = {}
-        
+        self.feed_options: Dict[str, Dict[str, Any]] = {}
+        self.feed_hosts: Dict[str, str] = {}
+        self.description_memo = DescriptionMemo()
+        self.body_digests: Dict[str, List[Any]] = {}
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        if parse_only:
+            return
+        self.session = _new_http_session()
+        self.feed_registry = FeedRegistry()
+        self.feed_cache = FeedCache()
+        self.channel_cache = YouTubeChannelCache()
+        self.item_store = ItemStore()
+        self.scheduler = FeedScheduler()
+        self.rate_limiter = HostRateLimiter()
+        self.circuit_breaker = CircuitBreaker()
+        self.search_tokens = SearchTokens()
+        self.thumbnail_cache = ThumbnailCache()
+
     def get_youtube_channel_info(self, url: str) -> Tuple[Optional[str], Optional[str]]:
-        """Extract YouTube channel ID and name from URL."""
+        """Extract YouTube channel ID and name from URL, using the resolution cache when possible."""
+        cached = self.channel_cache.get(url)
+        if cached:
+            logger.debug(f"Channel cache hit for {url} ({cached.get('strategy') or 'failed'})")
+            return cached.get('channel_id'), cached.get('channel_name')
+
+        channel_id, channel_name, strategy = self._resolve_youtube_channel(url)
+        if not channel_id:
+            # Keep serving an expired resolution rather than losing the channel
+            stale = self.channel_cache.get(url, allow_stale=True)
+            if stale and stale.get('channel_id'):
+                logger.warning(f"Re-resolution failed for {url}; keeping cached channel {stale['channel_id']}")
+                return stale['channel_id'], stale.get('channel_name')
+        self.channel_cache.store(url, channel_id, channel_name, strategy)
+        return channel_id, channel_name
+
+    def _resolve_youtube_channel(self, url: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """Scrape a YouTube channel page for its ID and name, reporting the strategy that worked."""
         logger.debug(f"Extracting YouTube channel info from: {url}")
 
         try:
             response = self.session.get(url, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'lxml')
+            soup = bs4.BeautifulSoup(response.text, 'lxml')
 
             # Try to find channel ID using multiple strategies
             channel_id = None
+            strategy = None
 
             # Strategy 1: meta itemprop tag
             meta_tag = soup.find('meta', itemprop='channelId')
             if meta_tag and meta_tag.get('content'):
                 channel_id = meta_tag['content']
+                strategy = 'meta_itemprop'
 
             # Strategy 2: canonical URL
             if not channel_id:
@@ -95,6 +1666,7 @@ class FeedProcessor:
                     match = re.search(r'channel/(UC[\w-]+)', link_tag['href'])
                     if match:
                         channel_id = match.group(1)
+                        strategy = 'canonical'
 
             # Strategy 3: og:url or twitter:url meta tags
             if not channel_id:
@@ -104,6 +1676,7 @@ class FeedProcessor:
                         match = re.search(r'channel/(UC[\w-]+)', meta['content'])
                         if match:
                             channel_id = match.group(1)
+                            strategy = prop
                             break
 
             # Strategy 4: externalId in inline JSON data
@@ -111,6 +1684,7 @@ class FeedProcessor:
                 match = re.search(r'"externalId"\s*:\s*"(UC[\w-]+)"', response.text)
                 if match:
                     channel_id = match.group(1)
+                    strategy = 'external_id'
 
             # Extract channel name
             channel_name = None
@@ -120,7 +1694,7 @@ class FeedProcessor:
                 channel_name = title_text.replace(' - YouTube', '').strip()
 
             if channel_id:
-                return channel_id, channel_name
+                return channel_id, channel_name, strategy
 
         except requests.RequestException as e:
             logger.warning(f"HTML scrape failed for {url}: {e}")
@@ -137,28 +1711,44 @@ class FeedProcessor:
                 if match:
                     channel_id = match.group(1)
                     logger.info(f"Resolved channel ID via fallback for {url}: {channel_id}")
-                    return channel_id, None
+                    return channel_id, None, 'videos_page'
         except requests.RequestException as e:
             logger.warning(f"Fallback resolution failed for {url}: {e}")
 
         logger.error(f"Could not extract channel ID from {url}")
-        return None, None
-    
+        return None, None, None
+
     def process_urls_file(self, file_path: str) -> List[str]:
-        """Process URLs file and convert YouTube channels to RSS feeds."""
+        """Return the feed URLs of a URLs file, compiling it into the feed registry if it changed.
+
+        Also sets the title overrides, options and hosts of those feeds.
+        """
+        compiled = self.feed_registry.get(file_path)
+        if compiled is not None:
+            logger.info(f"Using the compiled feed list for {file_path} ({len(compiled['feeds'])} feeds)")
+        else:
+            compiled = self._compile_urls_file(file_path)
+        feeds = compiled['feeds'] if compiled else []
+        self.feed_title_overrides = {feed['url']: feed['title'] for feed in feeds if feed.get('title')}
+        self.feed_options = {feed['url']: feed['options'] for feed in feeds if feed.get('options')}
+        self.feed_hosts = {url: host for host, urls in (compiled or {}).get('hosts', {}).items() for url in urls}
+        return [feed['url'] for feed in feeds]
+
+    def _compile_urls_file(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Parse a URLs file, convert YouTube channels to RSS feeds and store the result in the registry."""
         logger.info(f"Processing URLs from {file_path}")
-        self.feed_title_overrides = {}
-        
+
         try:
             with open(file_path, 'r') as f:
                 lines = f.readlines()
         except FileNotFoundError:
             logger.error(f"URLs file {file_path} not found")
-            return []
-        
-        rss_urls: List[str] = []
+            return None
+
+        rss_urls: List[Tuple[str, Dict[str, Any]]] = []
         youtube_entries: List[Tuple[str, Optional[str]]] = []
         youtube_rss_urls: List[Tuple[str, Optional[str]]] = []
+        youtube_options: Dict[str, Dict[str, Any]] = {}
         current_section = None
         pending_comment: Optional[str] = None
 
@@ -180,13 +1770,16 @@ class FeedProcessor:
                         pending_comment = line
                 continue
 
+            url, options = _parse_feed_line(line)
             if current_section == 'rss':
-                if 'youtube.com/feeds/videos.xml' in line:
-                    youtube_rss_urls.append((line, None))
+                if 'youtube.com/feeds/videos.xml' in url:
+                    youtube_rss_urls.append((url, None))
+                    youtube_options[url] = options
                 else:
-                    rss_urls.append(line)
+                    rss_urls.append((url, options))
             elif current_section == 'youtube':
-                youtube_entries.append((line, pending_comment))
+                youtube_entries.append((url, pending_comment))
+                youtube_options[url] = options
                 pending_comment = None
 
         # Combine any YouTube RSS URLs found in the RSS section
@@ -196,6 +1789,7 @@ class FeedProcessor:
         converted_entries: List[Tuple[str, str, Optional[str]]] = []
         
         to_convert = []
+        complete = True
         for youtube_url, comment in youtube_entries:
             if 'youtube.com/feeds/videos.xml' in youtube_url:
                 # Already an RSS feed; try to determine channel name
@@ -234,28 +1828,27 @@ class FeedProcessor:
                     else:
                         converted_entries.append((original_url, original_url, channel_name))
                         logger.warning(f"Could not convert YouTube channel: {original_url}")
+                        complete = False
+            self.channel_cache.save()
         
         # Write back converted YouTube URLs to feeds.txt
         self._update_feeds_file(file_path, converted_entries)
 
-        # Return all RSS URLs, using YouTube's long-form uploads playlist when Shorts are disabled
-        youtube_feed_urls = []
-        for url, _, channel_name in converted_entries:
+        # List all feeds, using YouTube's long-form uploads playlist for channels without Shorts
+        feeds = [{'url': url, 'title': None, 'options': options} for url, options in rss_urls]
+        for url, original_url, channel_name in converted_entries:
             if not url.startswith("https://www.youtube.com/feeds/videos.xml"):
                 continue
-            if not INCLUDE_YOUTUBE_SHORTS:
+            options = dict(youtube_options.get(original_url, {}))
+            if not options.pop('shorts', INCLUDE_YOUTUBE_SHORTS):
                 url = url.replace('channel_id=UC', 'playlist_id=UULF', 1)
-            youtube_feed_urls.append(url)
-            if channel_name:
-                self.feed_title_overrides[url] = channel_name
-
-        if not INCLUDE_YOUTUBE_SHORTS:
-            logger.info("YouTube Shorts disabled; using long-form uploads playlists")
-
-        all_rss_urls = rss_urls + youtube_feed_urls
+            feeds.append({'url': url, 'title': channel_name, 'options': options})
 
-        logger.info(f"Found {len(all_rss_urls)} RSS feeds to process")
-        return all_rss_urls
+        logger.info(f"Found {len(feeds)} RSS feeds to process")
+        if not complete:
+            # Not compiled, so the failed channels are looked up again on the next run
+            return {'feeds': feeds}
+        return self.feed_registry.put(file_path, feeds)
     
     def _update_feeds_file(self, file_path: str, converted_entries: List[Tuple[str, str, Optional[str]]]) -> None:
         """Replace YouTube channel URLs in feeds.txt with their RSS feed equivalents."""
@@ -279,13 +1872,15 @@ class FeedProcessor:
 
         new_lines = []
         for line in lines:
-            stripped = line.strip()
-            if stripped in replacements:
-                rss_url, channel_name = replacements[stripped]
+            parts = line.split(None, 1)
+            url = parts[0] if parts else ''
+            options = parts[1].strip() if len(parts) > 1 else ''
+            if url in replacements:
+                rss_url, channel_name = replacements[url]
                 if channel_name:
                     new_lines.append(f"# {channel_name}\n")
-                new_lines.append(f"{rss_url}\n")
-                logger.info(f"Updated feeds.txt: {stripped} -> {rss_url}")
+                new_lines.append(f"{rss_url} {options}\n" if options else f"{rss_url}\n")
+                logger.info(f"Updated feeds.txt: {url} -> {rss_url}")
             else:
                 new_lines.append(line)
 
@@ -296,32 +1891,68 @@ class FeedProcessor:
         except IOError as e:
             logger.error(f"Could not update {file_path}: {e}")
 
-    def fetch_single_feed(self, url: str, stats: Optional[FeedStats] = None) -> List[Dict[str, Any]]:
-        """Fetch and parse a single RSS feed with retry logic."""
+    def fetch_single_feed(self, url: str, stats: Optional[FeedStats] = None,
+                          handle_response: Optional[Callable[..., List[FeedItem]]] = None) -> List[FeedItem]:
+        """Fetch and parse a single RSS feed with retry logic.
+
+        handle_response replaces _handle_feed_response, e.g. to queue the body for a parse worker.
+        """
+        handle_response = handle_response or self._handle_feed_response
+        host = self.feed_host(url)
         last_error = None
 
         for attempt in range(MAX_RETRIES):
+            if not self.circuit_breaker.allow(host, time.time()):
+                logger.debug(f"Skipping {url}: circuit breaker open for {host}")
+                if stats:
+                    stats.record_short_circuit(url)
+                return []
+            wait = self.rate_limiter.reserve(host)
+            if wait:
+                if stats:
+                    stats.record_rate_limit_wait(wait)
+                time.sleep(wait)
             try:
-                response = self.session.get(url, timeout=REQUEST_TIMEOUT)
-                response.raise_for_status()
-
-                feed = feedparser.parse(response.content)
-                if feed.bozo and isinstance(feed.bozo_exception, Exception):
-                    logger.warning(f"Parse error for {url}: {feed.bozo_exception}")
-                    if not feed.entries:
-                        if stats:
-                            stats.record_failure(url, f"Parse error: {feed.bozo_exception}")
-                        return []
-
-                items = self._process_feed_entries(feed, url)
+                headers = self.feed_cache.conditional_headers(url)
+                start = time.perf_counter()
+                truncated = False
+                try:
+                    if STREAM_FEEDS:
+                        with self.session.get(url, timeout=REQUEST_TIMEOUT, headers=headers, stream=True) as response:
+                            reader = self._new_stream_reader(url)
+                            for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                                if not reader.feed(chunk):
+                                    break
+                        content, size, truncated = reader.content(), reader.bytes_read, reader.stopped
+                    else:
+                        response = self.session.get(url, timeout=REQUEST_TIMEOUT, headers=headers)
+                        content = response.content
+                        size = len(content)
+                finally:
+                    if stats:
+                        stats.add_metric(url, 'total_time', time.perf_counter() - start)
                 if stats:
-                    stats.record_success(url)
-                return items
+                    # requests does not expose DNS/connect phases; elapsed is time to response headers
+                    stats.record_metrics(url, ttfb=response.elapsed.total_seconds(), bytes=size,
+                                         status=response.status_code, attempts=attempt + 1, truncated=truncated)
+                if response.status_code in THROTTLE_STATUSES:
+                    last_error = f"HTTP {response.status_code} from {host}"
+                    if self._throttled(host, response.headers, attempt, stats) and attempt < MAX_RETRIES - 1:
+                        logger.debug(f"Retry {attempt + 1}/{MAX_RETRIES} for {url} after {last_error}")
+                        if stats:
+                            stats.record_retry()
+                        continue
+                    logger.error(f"Error fetching feed {url}: {last_error}")
+                    break
+                response.raise_for_status()
+                self.circuit_breaker.record_success(host)
+                self._record_body_digest(url, response.status_code, reader.downloaded() if STREAM_FEEDS else content)
+                return handle_response(url, response.status_code, response.headers, content, stats)
 
             except requests.RequestException as e:
                 last_error = str(e)
                 if attempt < MAX_RETRIES - 1:
-                    delay = RETRY_BASE_DELAY * (2 ** attempt)  # Exponential backoff
+                    delay = _backoff_delay(attempt)
                     logger.debug(f"Retry {attempt + 1}/{MAX_RETRIES} for {url} after {delay}s")
                     if stats:
                         stats.record_retry()
@@ -337,30 +1968,395 @@ class FeedProcessor:
             stats.record_failure(url, last_error or "Unknown error")
         return []
 
-    def fetch_feeds(self, urls: List[str]) -> Tuple[List[Dict[str, Any]], FeedStats]:
-        """Fetch and parse RSS feeds from URLs in parallel."""
+    def _record_body_digest(self, url: str, status_code: int, body: bytes) -> None:
+        """Remember the size and hash of the bytes downloaded, for --check to compare against."""
+        if status_code == 200:
+            self.body_digests[url] = [len(body), hashlib.sha256(body).hexdigest()]
+
+    def _throttled(self, host: str, headers: Mapping[str, str], attempt: int, stats: Optional[FeedStats]) -> bool:
+        """Back off a host that answered 429/503; return False if the feed should not be retried."""
+        now = time.time()
+        retry_after = _retry_after(headers, now)
+        if stats:
+            stats.record_throttled()
+        if self.circuit_breaker.record_throttled(host, now, retry_after):
+            if stats:
+                stats.record_trip(host)
+            return False
+        # Every feed on the host waits, not just this one
+        self.rate_limiter.block(host, retry_after if retry_after is not None else _backoff_delay(attempt))
+        return True
+
+    def _handle_feed_response(self, url: str, status_code: int, headers: Mapping[str, str], content: bytes,
+                              stats: Optional[FeedStats] = None) -> List[FeedItem]:
+        """Turn a successful (2xx/304) feed response into items, reusing cached items when possible."""
+        body_hash = hashlib.sha256(content).hexdigest()
+        items = self._reuse_response(url, status_code, body_hash, stats)
+        if items is not None:
+            return items
+        if self._parse_pool is not None:
+            parsed = self._submit_parse(url, content).result()
+        else:
+            parsed = self._parse_feed(url, content)
+        return self._store_parsed_feed(url, headers, body_hash, parsed, stats)
+
+    def _submit_parse(self, url: str, content: bytes) -> Any:
+        """Queue a feed body on the parse pool along with the state _process_feed_entries reads."""
+        return self._parse_pool.submit(_parse_feed_in_worker, url, content, self.feed_title_overrides.get(url),
+                                       self.feed_options.get(url), self.item_store.feed_entries(url), self.utc_now)
+
+    def _reuse_response(self, url: str, status_code: int, body_hash: str,
+                        stats: Optional[FeedStats] = None) -> Optional[List[FeedItem]]:
+        """Return cached items for a 304 or an identical body, or None if the body must be parsed."""
+        # Not modified: reuse the items parsed on a previous run
+        if status_code == 304:
+            if stats:
+                stats.record_not_modified()
+                stats.record_success(url)
+            items = self._reuse_cached_items(url) or []
+            self.item_store.upsert(url, items)
+            if stats:
+                stats.record_metrics(url, outcome='not_modified', items=len(items))
+            return items
+
+        # Identical body: skip feedparser entirely
+        if body_hash == self.feed_cache.content_hash(url):
+            cached_items = self._reuse_cached_items(url)
+            if cached_items is not None:
+                if stats:
+                    stats.record_unchanged()
+                    stats.record_success(url)
+                    stats.record_metrics(url, outcome='unchanged', items=len(cached_items))
+                self.item_store.upsert(url, cached_items)
+                return cached_items
+        return None
+
+    def _parse_feed(self, url: str, content: bytes,
+                    stored: Optional[Mapping[str, Tuple[Optional[str], FeedItem]]] = None) -> ParsedFeed:
+        """Parse a feed body and process its entries; the CPU-bound part of handling a response.
+
+        stored is the feed's item_store.feed_entries(), read from the store when not given.
+        """
+        start = time.perf_counter()
+        feed = feedparser.parse(content)
+        parse_time = time.perf_counter() - start
+        error = None
+        if feed.bozo and isinstance(feed.bozo_exception, Exception):
+            error = str(feed.bozo_exception)
+            if not feed.entries:
+                return ParsedFeed(None, error=error, parse_time=parse_time)
+
+        start = time.perf_counter()
+        sources: Dict[str, str] = {}
+        items = self._process_feed_entries(feed, url, stored, sources)
+        return ParsedFeed(items, entries=len(feed.entries), error=error, parse_time=parse_time,
+                          process_time=time.perf_counter() - start, sources=sources)
+
+    def _store_parsed_feed(self, url: str, headers: Mapping[str, str], body_hash: str, parsed: ParsedFeed,
+                           stats: Optional[FeedStats] = None) -> List[FeedItem]:
+        """Record a parsed feed in the caches and item store."""
+        if parsed.memo_entries or parsed.memo_hits or parsed.memo_misses:
+            self.description_memo.merge(parsed.memo_entries, parsed.memo_hits, parsed.memo_misses)
+        if parsed.error:
+            logger.warning(f"Parse error for {url}: {parsed.error}")
+        if parsed.items is None:
+            if stats:
+                stats.record_failure(url, f"Parse error: {parsed.error}")
+            return []
+
+        self.feed_cache.store(url, headers, body_hash, parsed.items)
+        self.item_store.upsert(url, parsed.items, parsed.sources)
+        if stats:
+            stats.record_success(url)
+            stats.record_metrics(url, outcome='parsed', items=len(parsed.items), entries=parsed.entries,
+                                 parse_time=parsed.parse_time, process_time=parsed.process_time)
+        return parsed.items
+
+    def _new_stream_reader(self, url: str) -> _FeedStreamReader:
+        return _FeedStreamReader(self.retention_cutoff(url))
+
+    def retention_cutoff(self, url: str, feed_options: Optional[Mapping[str, Mapping[str, Any]]] = None) -> datetime:
+        """Return the oldest publish time kept for a feed, from its retention option or ITEMS_RETENTION_DAYS.
+
+        feed_options defaults to this processor's; run_batch passes each list's own.
+        """
+        options = (self.feed_options if feed_options is None else feed_options).get(url, {})
+        days = min(options.get('retention', ITEMS_RETENTION_DAYS), ITEMS_RETENTION_DAYS)
+        return self.utc_now - timedelta(days=days)
+
+    def feed_caps(self, feed_options: Optional[Mapping[str, Mapping[str, Any]]] = None) -> Dict[str, int]:
+        """Return the max_items option of each feed that has one."""
+        feed_options = self.feed_options if feed_options is None else feed_options
+        return {url: options['max_items'] for url, options in feed_options.items() if 'max_items' in options}
+
+    def feed_host(self, url: str) -> str:
+        return self.feed_hosts.get(url) or urlparse(url).hostname or ''
+
+    def _reuse_cached_items(self, url: str) -> Optional[List[FeedItem]]:
+        """Return cached items still inside the retention window, with current title overrides."""
+        cached_items = self.feed_cache.get_items(url)
+        if cached_items is None:
+            return None
+        cutoff = self.retention_cutoff(url).timestamp()
+        override = self.feed_title_overrides.get(url)
+        items = []
+        for item in cached_items:
+            if item.published < cutoff:
+                continue
+            if override:
+                item.feed_title = sys.intern(override)
+            items.append(item)
+        logger.debug(f"Reusing {len(items)} cached items for {url}")
+        return items
+
+    def fetch_feeds(self, urls: List[str]) -> FeedStats:
+        """Fetch and parse RSS feeds from URLs in parallel into the item store.
+
+        Items go straight into item_store as each feed is handled; nothing holds the whole run's
+        items, so the page is built from the store with load_items().
+        """
         logger.info(f"Fetching {len(urls)} feeds")
-        all_items = []
+        fetched = 0
         stats = FeedStats(total=len(urls))
 
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            future_to_url = {executor.submit(self.fetch_single_feed, url, stats): url for url in urls}
-            for i, future in enumerate(as_completed(future_to_url)):
-                url = future_to_url[future]
-                items = future.result()
-                all_items.extend(items)
-                if (i + 1) % 10 == 0 or (i + 1) == len(urls):
-                    logger.info(f"Processed {i+1}/{len(urls)} feeds")
+        with self._parse_processes():
+            if FETCH_ENGINE == 'async':
+                import asyncio
+                try:
+                    fetched = asyncio.run(self._fetch_feeds_async(urls, stats))
+                    stats.log_summary()
+                    logger.info(f"Fetched {fetched} total items")
+                    return stats
+                except ImportError:
+                    logger.warning("aiohttp is not installed; falling back to the thread pool fetch engine")
+
+            sent_before, opened_before = _connection_counts(self.session)
+            if self._parse_pool is not None:
+                fetched = self._fetch_feeds_pipelined(urls, stats)
+            else:
+                with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                    future_to_url = {executor.submit(self.fetch_single_feed, url, stats): url for url in urls}
+                    for i, future in enumerate(as_completed(future_to_url)):
+                        fetched += len(future.result())
+                        if (i + 1) % 10 == 0 or (i + 1) == len(urls):
+                            logger.info(f"Processed {i+1}/{len(urls)} feeds")
+            sent, opened = _connection_counts(self.session)
+            stats.record_connections(opened - opened_before, (sent - sent_before) - (opened - opened_before))
 
         stats.log_summary()
-        logger.info(f"Fetched {len(all_items)} total items")
-        return all_items, stats
-    
-    def _process_feed_entries(self, feed: feedparser.FeedParserDict, url: str) -> List[Dict[str, Any]]:
-        """Process entries from a single feed."""
+        logger.info(f"Fetched {fetched} total items")
+        return stats
+
+    @contextmanager
+    def _parse_processes(self) -> Iterator[Optional[ProcessPoolExecutor]]:
+        """Run feed parsing in PARSE_PROCESSES worker processes for the duration of the block."""
+        if PARSE_PROCESSES <= 1 or self._parse_pool is not None:
+            # Nested blocks (--serve keeps one pool across refreshes) share the outer pool
+            yield self._parse_pool
+            return
+        # spawn, not fork: the fetch threads may hold locks when the pool starts a worker
+        pool = ProcessPoolExecutor(max_workers=PARSE_PROCESSES, mp_context=multiprocessing.get_context('spawn'),
+                                   initializer=_init_parse_worker, initargs=(self.timezone,))
+        self._parse_pool = pool
+        try:
+            yield pool
+        finally:
+            self._parse_pool = None
+            pool.shutdown()
+
+    def _fetch_feeds_pipelined(self, urls: List[str], stats: FeedStats) -> int:
+        """Download on threads and parse in worker processes, with a bounded queue between the stages.
+
+        Returns the number of items stored.
+        """
+        responses: 'queue.Queue[Optional[Tuple[str, int, Mapping[str, str], bytes]]]' = queue.Queue(maxsize=PARSE_QUEUE_SIZE)
+
+        def enqueue(url: str, status_code: int, headers: Mapping[str, str], content: bytes,
+                    stats: Optional[FeedStats] = None) -> List[FeedItem]:
+            responses.put((url, status_code, headers, content))
+            return []
+
+        def download() -> None:
+            try:
+                with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                    for future in as_completed([executor.submit(self.fetch_single_feed, url, stats, enqueue) for url in urls]):
+                        future.result()
+            finally:
+                responses.put(None)
+
+        downloader = threading.Thread(target=download, name='feed-downloads', daemon=True)
+        downloader.start()
+
+        fetched = 0
+        parsing: Dict[Any, Tuple[str, Mapping[str, str], str]] = {}
+        done_count = 0
+
+        def finish(futures: Iterable[Any]) -> None:
+            nonlocal done_count, fetched
+            for future in futures:
+                url, headers, body_hash = parsing.pop(future)
+                try:
+                    fetched += len(self._store_parsed_feed(url, headers, body_hash, future.result(), stats))
+                except Exception as e:
+                    logger.error(f"Error processing feed {url}: {e}")
+                    stats.record_failure(url, str(e))
+                done_count += 1
+                if done_count % 10 == 0:
+                    logger.info(f"Parsed {done_count} feeds")
+
+        while True:
+            response = responses.get()
+            if response is None:
+                break
+            url, status_code, headers, content = response
+            try:
+                body_hash = hashlib.sha256(content).hexdigest()
+                items = self._reuse_response(url, status_code, body_hash, stats)
+            except Exception as e:
+                logger.error(f"Error processing feed {url}: {e}")
+                stats.record_failure(url, str(e))
+                continue
+            if items is not None:
+                fetched += len(items)
+                continue
+            parsing[self._submit_parse(url, content)] = (url, headers, body_hash)
+            # Keep every worker busy without buffering unbounded parse results
+            if len(parsing) >= PARSE_PROCESSES * 2:
+                finish(wait(parsing, return_when=FIRST_COMPLETED).done)
+        finish(list(as_completed(parsing)))
+        downloader.join()
+        return fetched
+
+    async def _fetch_feeds_async(self, urls: List[str], stats: FeedStats) -> int:
+        """Fetch feeds on one event loop with a global budget and per-host semaphores."""
+        import asyncio
+        import aiohttp
+
+        global_limit = asyncio.Semaphore(ASYNC_MAX_CONCURRENCY)
+        host_limits: Dict[str, asyncio.Semaphore] = {}
+        for url in urls:
+            host = self.feed_host(url)
+            if host not in host_limits:
+                host_limits[host] = asyncio.Semaphore(HOST_CONNECTION_LIMITS.get(host, ASYNC_PER_HOST_LIMIT))
+
+        connector = aiohttp.TCPConnector(limit=ASYNC_MAX_CONCURRENCY, limit_per_host=max(HOST_CONNECTION_LIMITS.values(), default=ASYNC_PER_HOST_LIMIT))
+        timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        loop = asyncio.get_running_loop()
+        fetched = 0
+
+        # Record DNS and connect phases per request; reused connections report neither
+        trace_config = aiohttp.TraceConfig()
+
+        def phase_timer(name: str, edge: str):
+            async def callback(session, context, params):
+                timings = context.trace_request_ctx
+                if edge == 'start':
+                    timings[f'_{name}_start'] = loop.time()
+                elif f'_{name}_start' in timings:
+                    timings[name] = loop.time() - timings.pop(f'_{name}_start')
+            return callback
+
+        trace_config.on_dns_resolvehost_start.append(phase_timer('dns_time', 'start'))
+        trace_config.on_dns_resolvehost_end.append(phase_timer('dns_time', 'end'))
+        trace_config.on_connection_create_start.append(phase_timer('connect_time', 'start'))
+        trace_config.on_connection_create_end.append(phase_timer('connect_time', 'end'))
+
+        async def count_connection(session, context, params):
+            stats.record_connections(1, 0)
+
+        async def count_reuse(session, context, params):
+            stats.record_connections(0, 1)
+
+        trace_config.on_connection_create_end.append(count_connection)
+        trace_config.on_connection_reuseconn.append(count_reuse)
+
+        # Parsing stays off the event loop so slow feeds never stall other downloads
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as parse_pool:
+            async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers={'User-Agent': USER_AGENT},
+                                             trace_configs=[trace_config]) as session:
+
+                async def fetch_one(url: str) -> List[FeedItem]:
+                    host = self.feed_host(url)
+                    host_limit = host_limits[host]
+                    last_error = None
+                    for attempt in range(MAX_RETRIES):
+                        if not self.circuit_breaker.allow(host, time.time()):
+                            logger.debug(f"Skipping {url}: circuit breaker open for {host}")
+                            stats.record_short_circuit(url)
+                            return []
+                        wait = self.rate_limiter.reserve(host)
+                        if wait:
+                            stats.record_rate_limit_wait(wait)
+                            await asyncio.sleep(wait)
+                        try:
+                            async with host_limit, global_limit:
+                                headers = self.feed_cache.conditional_headers(url)
+                                timings: Dict[str, float] = {}
+                                start = loop.time()
+                                try:
+                                    async with session.get(url, headers=headers, trace_request_ctx=timings) as response:
+                                        ttfb = loop.time() - start
+                                        status_code, response_headers = response.status, response.headers
+                                        if STREAM_FEEDS:
+                                            reader = self._new_stream_reader(url)
+                                            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                                                if not reader.feed(chunk):
+                                                    break
+                                            content, size, truncated = reader.content(), reader.bytes_read, reader.stopped
+                                        else:
+                                            content = await response.read()
+                                            size, truncated = len(content), False
+                                finally:
+                                    stats.add_metric(url, 'total_time', loop.time() - start)
+                                stats.record_metrics(url, ttfb=ttfb, bytes=size, status=status_code, attempts=attempt + 1,
+                                                     truncated=truncated, **{k: v for k, v in timings.items() if not k.startswith('_')})
+                                if status_code in THROTTLE_STATUSES:
+                                    last_error = f"HTTP {status_code} from {host}"
+                                    if self._throttled(host, response_headers, attempt, stats) and attempt < MAX_RETRIES - 1:
+                                        logger.debug(f"Retry {attempt + 1}/{MAX_RETRIES} for {url} after {last_error}")
+                                        stats.record_retry()
+                                        continue
+                                    logger.error(f"Error fetching feed {url}: {last_error}")
+                                    break
+                                response.raise_for_status()
+                            self.circuit_breaker.record_success(host)
+                            self._record_body_digest(url, status_code, reader.downloaded() if STREAM_FEEDS else content)
+                            return await loop.run_in_executor(
+                                parse_pool, self._handle_feed_response, url, status_code, response_headers, content, stats)
+                        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                            last_error = str(e) or type(e).__name__
+                            if attempt < MAX_RETRIES - 1:
+                                delay = _backoff_delay(attempt)
+                                logger.debug(f"Retry {attempt + 1}/{MAX_RETRIES} for {url} after {delay}s")
+                                stats.record_retry()
+                                await asyncio.sleep(delay)
+                            else:
+                                logger.error(f"Error fetching feed {url} after {MAX_RETRIES} attempts: {last_error}")
+                        except Exception as e:
+                            last_error = str(e)
+                            logger.error(f"Error processing feed {url}: {e}")
+                            break
+                    stats.record_failure(url, last_error or "Unknown error")
+                    return []
+
+                tasks = [asyncio.ensure_future(fetch_one(url)) for url in urls]
+                for i, task in enumerate(asyncio.as_completed(tasks)):
+                    fetched += len(await task)
+                    if (i + 1) % 10 == 0 or (i + 1) == len(urls):
+                        logger.info(f"Processed {i+1}/{len(urls)} feeds")
+
+        return fetched
+
+    def _process_feed_entries(self, feed: 'feedparser.FeedParserDict', url: str,
+                              stored: Optional[Mapping[str, Tuple[Optional[str], FeedItem]]] = None,
+                              sources: Optional[Dict[str, str]] = None) -> List[FeedItem]:
+        """Process entries from a single feed, recording each item's source key in sources if given."""
         items = []
         is_youtube_feed = 'youtube.com' in url
-        cutoff_time = self.utc_now - timedelta(days=ITEMS_RETENTION_DAYS)
+        cutoff_time = self.retention_cutoff(url)
+        feed_title = self.feed_title_overrides.get(url) or getattr(feed.feed, 'title', '')
+        if stored is None:
+            stored = self.item_store.feed_entries(url)
 
         for entry in feed.entries:
             try:
@@ -375,39 +2371,78 @@ class FeedProcessor:
                 if published_time < cutoff_time:
                     continue
 
-                # Convert to local timezone
-                published_time = published_time.astimezone(self.local_tz)
-
-                # Extract thumbnail, video info, and YouTube description
-                thumbnail_url, video_id, yt_desc = self._extract_media_info(entry, is_youtube_feed)
-
-                # Clean description text (prefer YouTube description if available)
-                description = yt_desc if yt_desc else self._clean_description(entry)
-
-                items.append({
-                    'id': item_id,
-                    'title': entry.get('title') or 'Untitled',
-                    'link': link,
-                    'published': published_time,
-                    'thumbnail': thumbnail_url,
-                    'feed_title': self.feed_title_overrides.get(url) or getattr(feed.feed, 'title', ''),
-                    'video_id': video_id,
-                    'description': description,
-                })
+                published = int(published_time.timestamp())
+
+                source = self._entry_source_key(entry)
+                stored_source, stored_item = stored.get(item_id, (None, None))
+                if stored_item is not None and stored_source == source:
+                    # Unchanged entry: keep the already-cleaned description and thumbnail
+                    thumbnail_url, video_id, description = (stored_item.thumbnail, stored_item.video_id,
+                                                            stored_item.description)
+                else:
+                    thumbnail_url, video_id, description = self._describe_entry(entry, is_youtube_feed)
+                if sources is not None:
+                    sources[item_id] = source
+
+                items.append(FeedItem(
+                    id=item_id,
+                    title=entry.get('title') or 'Untitled',
+                    link=link,
+                    published=published,
+                    thumbnail=thumbnail_url,
+                    feed_title=feed_title,
+                    video_id=video_id,
+                    description=description,
+                ))
             except Exception as e:
                 entry_ref = entry.get('id') or entry.get('link') or 'unknown entry'
                 logger.warning(f"Skipping malformed entry {entry_ref} from {url}: {e}")
         
         return items
     
-    def _get_entry_time(self, entry: feedparser.FeedParserDict) -> datetime:
+    def _entry_source_key(self, entry: 'feedparser.FeedParserDict') -> str:
+        """Hash the raw entry fields an item's description, thumbnail and video ID are built from.
+
+        Entries are often edited in place without a new published date, so stored items are only
+        reused while this still matches.
+        """
+        media_thumbnail = entry.media_thumbnail[0]['url'] if getattr(entry, 'media_thumbnail', None) else ''
+        return self.description_memo.key_for(
+            entry.get('updated') or '', entry.get('link') or '', entry.get('yt_videoid') or '',
+            entry.get('media_description') or '', self._get_description_source(entry),
+            self._get_content_html(entry), media_thumbnail)
+
+    def _describe_entry(self, entry: 'feedparser.FeedParserDict', is_youtube: bool) -> Tuple[str, Optional[str], str]:
+        """Return thumbnail URL, video ID and cleaned description, memoized by raw HTML hash."""
+        if is_youtube:
+            # Extract thumbnail, video info, and YouTube description
+            thumbnail_url, video_id, yt_desc = self._extract_media_info(entry, is_youtube)
+
+            # Clean description text (prefer YouTube description if available)
+            description = yt_desc if yt_desc else self._clean_description(entry)
+            return thumbnail_url, video_id, description
+
+        media_thumbnail = entry.media_thumbnail[0]['url'] if getattr(entry, 'media_thumbnail', None) else ''
+        memo_key = self.description_memo.key_for(
+            self._get_description_source(entry), self._get_content_html(entry), media_thumbnail)
+        cached = self.description_memo.get(memo_key)
+        if cached is not None:
+            description, thumbnail_url = cached
+            return thumbnail_url, None, description
+
+        thumbnail_url, video_id, _ = self._extract_media_info(entry, is_youtube)
+        description = self._clean_description(entry)
+        self.description_memo.put(memo_key, description, thumbnail_url)
+        return thumbnail_url, video_id, description
+
+    def _get_entry_time(self, entry: 'feedparser.FeedParserDict') -> datetime:
         """Extract published time from feed entry."""
         for time_attr in ['published_parsed', 'updated_parsed']:
             if hasattr(entry, time_attr) and getattr(entry, time_attr):
                 return datetime(*getattr(entry, time_attr)[:6], tzinfo=pytz.utc)
         return self.utc_now
     
-    def _extract_media_info(self, entry: feedparser.FeedParserDict, is_youtube: bool) -> Tuple[str, Optional[str], str]:
+    def _extract_media_info(self, entry: 'feedparser.FeedParserDict', is_youtube: bool) -> Tuple[str, Optional[str], str]:
         """Extract thumbnail URL, video ID, and description from entry."""
         thumbnail_url = ''
         video_id = None
@@ -434,22 +2469,43 @@ class FeedProcessor:
                 thumbnail_url = entry.media_thumbnail[0]['url']
             else:
                 # Look in content for image
-                for content_attr in ['content']:
-                    if hasattr(entry, content_attr):
-                        content = getattr(entry, content_attr)
-                        if isinstance(content, list):
-                            content = content[0].value if content else ''
-                        
-                        soup = BeautifulSoup(str(content), 'lxml')
-                        img_tag = soup.find('img')
-                        if img_tag and img_tag.get('src'):
-                            thumbnail_url = img_tag['src']
-                            break
+                content = self._get_content_html(entry)
+                if content:
+                    soup = bs4.BeautifulSoup(content, 'lxml')
+                    img_tag = soup.find('img')
+                    if img_tag and img_tag.get('src'):
+                        thumbnail_url = img_tag['src']
         
         return thumbnail_url, video_id, description
 
-    def _clean_description(self, entry: feedparser.FeedParserDict) -> str:
+    def _get_content_html(self, entry: 'feedparser.FeedParserDict') -> str:
+        """Return the entry content searched for a thumbnail image, or '' if it has none."""
+        if not hasattr(entry, 'content'):
+            return ''
+        content = entry.content
+        if isinstance(content, list):
+            content = content[0].value if content else ''
+        return str(content)
+
+    def _clean_description(self, entry: 'feedparser.FeedParserDict') -> str:
         """Extract and clean description/summary text from entry."""
+        text = self._get_description_source(entry)
+        if not text:
+            return ''
+
+        sanitizer = _DescriptionSanitizer()
+        parser = etree.HTMLParser(target=sanitizer, recover=True)
+        try:
+            parser.feed(text)
+            parser.close()
+        except _DescriptionBudgetReached:
+            return sanitizer.result(stopped=True)
+        except (UnicodeDecodeError, LookupError, etree.ParserError):
+            return self._clean_description_soup(text)
+        return sanitizer.result(stopped=False)
+
+    def _get_description_source(self, entry: 'feedparser.FeedParserDict') -> str:
+        """Return the raw summary or content HTML for an entry."""
         text = ''
         
         # Try summary/summary_detail first
@@ -466,20 +2522,20 @@ class FeedProcessor:
             elif hasattr(content, 'value'):
                 text = content.value
         
-        if not text:
-            return ''
-        
+        return text
+
+    def _clean_description_soup(self, text: str) -> str:
+        """Clean description HTML with BeautifulSoup; reference for _DescriptionSanitizer."""
         # Parse HTML
-        soup = BeautifulSoup(text, 'lxml')
+        soup = bs4.BeautifulSoup(text, 'lxml')
         
         # Remove dangerous tags
-        for tag in soup(['script', 'style', 'noscript', 'iframe', 'object', 'embed', 'form', 'input']):
+        for tag in soup(list(REMOVED_DESCRIPTION_TAGS)):
             tag.decompose()
         
         # Remove dangerous attributes
-        allowed_tags = {'br', 'p', 'b', 'i', 'em', 'strong', 'a', 'ul', 'ol', 'li', 'blockquote', 'code', 'pre', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'span', 'div'}
         for tag in soup.find_all(True):
-            if tag.name not in allowed_tags:
+            if tag.name not in ALLOWED_DESCRIPTION_TAGS:
                 tag.unwrap()
             # Remove event handlers and other dangerous attributes
             attrs_to_remove = [attr for attr in tag.attrs if attr.startswith('on') or attr in ['style', 'class', 'id']]
@@ -496,7 +2552,7 @@ class FeedProcessor:
         html = html.strip()
         
         # Limit length - truncate at word boundary
-        max_len = 500
+        max_len = DESCRIPTION_MAX_LENGTH
         if len(html) > max_len:
             # Find text content length for truncation
             text_only = soup.get_text()
@@ -511,7 +2567,7 @@ class FeedProcessor:
                         break
                 
                 # Rebuild with truncation
-                result_soup = BeautifulSoup('', 'lxml')
+                result_soup = bs4.BeautifulSoup('', 'lxml')
                 for part in text_parts:
                     result_soup.append(part)
                 
@@ -527,11 +2583,22 @@ class FeedProcessor:
         
         return html
     
-    def sort_items(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Sort items by published date."""
-        return sorted(items, key=lambda x: x['published'], reverse=True)
-    
-    def process_items_for_display(self, items: List[Dict[str, Any]]) -> str:
+    def dedupe_items(self, items: List[FeedItem]) -> List[FeedItem]:
+        """Merge items that appear in several feeds, keeping the earliest copy; returns newest first."""
+        index = DuplicateIndex()
+        kept = []
+        # Oldest first, so the original post absorbs later reposts and aggregator entries
+        for item in sorted(items, key=attrgetter('published')):
+            original = index.add(item)
+            if original is None:
+                kept.append(item)
+            else:
+                original.merge(item)
+        kept.reverse()
+        logger.info(f"Merged {len(items) - len(kept)} duplicate items")
+        return kept
+
+    def process_items_for_display(self, items: List[FeedItem]) -> str:
         """Generate JSON for all items."""
         logger.info("Processing items for display")
 
@@ -540,17 +2607,167 @@ class FeedProcessor:
 
         return self._generate_all_items_json(items)
 
-    def _generate_all_items_json(self, items: List[Dict[str, Any]]) -> str:
-        """Generate JSON data for all items."""
-        serializable_items = []
-        for item in items:
-            item_copy = item.copy()
-            item_copy['published'] = item['published'].isoformat()
-            serializable_items.append(item_copy)
-        return json.dumps(serializable_items, indent=2)
+    def _generate_all_items_json(self, items: List[FeedItem]) -> str:
+        """Generate compact JSON data for all items."""
+        return ''.join(_iter_items_json(items, self.local_tz, feed_table=FEED_TITLE_TABLE))
     
-    def update_html_file(self, json_data: str, template_path: str = 'index.template.html', output_path: str = 'index.html') -> None:
-        """Update the HTML file with feed data."""
+    def write_feed_shards(self, items: List[FeedItem], data_dir: str = FEED_DATA_DIR) -> Tuple[str, Dict[str, Any]]:
+        """Write per-day JSON shards with content-hashed names.
+
+        Returns the newest shard's JSON for inlining and the manifest describing every shard.
+        """
+        logger.info(f"Writing feed shards to {data_dir}")
+        shards: Dict[str, List[FeedItem]] = {}
+        local_time = _LocalTimeFormatter(self.local_tz)
+        for item in items:
+            key = local_time(item.published)[:10]
+            shards.setdefault(key, []).append(item)
+
+        os.makedirs(data_dir, exist_ok=True)
+        manifest: Dict[str, Any] = {'inline': None, 'shards': []}
+        inline_json = '[]'
+        written = set()
+        for key in sorted(shards, reverse=True):
+            shard_json = self._generate_all_items_json(shards[key])
+            shard_bytes = shard_json.encode('utf-8')
+            digest = hashlib.sha256(shard_bytes).hexdigest()[:12]
+            file_name = f"{key}.{digest}.json"
+            file_path = os.path.join(data_dir, file_name)
+            if not os.path.exists(file_path):
+                try:
+                    with open(file_path, 'wb') as f:
+                        f.write(shard_bytes)
+                    if PRECOMPRESS_FEED_DATA:
+                        _write_precompressed(file_path, shard_bytes)
+                except IOError as e:
+                    logger.error(f"Could not write shard {file_path}: {e}")
+                    continue
+            written.add(file_name)
+            manifest['shards'].append({'key': key, 'file': f"{data_dir}/{file_name}", 'count': len(shards[key])})
+            if manifest['inline'] is None:
+                manifest['inline'] = key
+                inline_json = shard_json
+
+        # Remove shards from previous runs that are no longer referenced
+        for file_name in os.listdir(data_dir):
+            base_name = re.sub(r'\.(gz|br)$', '', file_name)
+            if base_name.endswith('.json') and base_name not in written and not base_name.startswith('search.'):
+                os.remove(os.path.join(data_dir, file_name))
+
+        logger.info(f"Wrote {len(manifest['shards'])} shards; inlining {manifest['inline'] or 'none'}")
+        return inline_json, manifest
+
+    def localize_thumbnails(self, items: List[FeedItem], output_dir: str = THUMBNAIL_DIR) -> None:
+        """Point item thumbnails at downscaled local copies, downloading the ones not cached yet."""
+        try:
+            from PIL import Image  # noqa: F401
+        except ImportError:
+            logger.warning("THUMBNAIL_CACHE needs Pillow (pip install Pillow); keeping remote thumbnails")
+            return
+        now = time.time()
+        urls = {item.thumbnail for item in items if item.thumbnail.startswith(('http://', 'https://'))}
+        missing = [url for url in urls if not self.thumbnail_cache.known(url, now)]
+        if missing:
+            os.makedirs(self.thumbnail_cache.directory, exist_ok=True)
+            with ThreadPoolExecutor(max_workers=THUMBNAIL_WORKERS) as executor:
+                for url, file_name in zip(missing, executor.map(self._fetch_thumbnail, missing)):
+                    self.thumbnail_cache.store(url, file_name, now)
+
+        local = {url: self.thumbnail_cache.file_for(url) for url in urls}
+        for item in items:
+            file_name = local.get(item.thumbnail)
+            if file_name:
+                item.thumbnail = f"{output_dir}/{file_name}"
+        cached = sum(1 for file_name in local.values() if file_name)
+        logger.info(f"Thumbnails: {cached}/{len(urls)} served locally, {len(missing)} downloaded or retried")
+
+    def _fetch_thumbnail(self, url: str) -> Optional[str]:
+        """Download and downscale one image into the thumbnail cache; returns its file name."""
+        from PIL import Image
+        try:
+            body = bytearray()
+            with self.session.get(url, timeout=REQUEST_TIMEOUT, stream=True) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                    body += chunk
+                    if len(body) > THUMBNAIL_MAX_BYTES:
+                        raise ValueError(f"larger than {THUMBNAIL_MAX_BYTES} bytes")
+            with Image.open(io.BytesIO(body)) as image:
+                image.draft('RGB', THUMBNAIL_MAX_SIZE)  # JPEG decoders can downscale while decoding
+                alpha = 'A' in image.getbands() or 'transparency' in image.info
+                image = image.convert('RGBA' if alpha else 'RGB')
+                image.thumbnail(THUMBNAIL_MAX_SIZE)
+                output = io.BytesIO()
+                image.save(output, THUMBNAIL_FORMAT, quality=THUMBNAIL_QUALITY)
+        except (requests.RequestException, OSError, ValueError, Image.DecompressionBombError) as e:
+            logger.debug(f"Could not cache thumbnail {url}: {e}")
+            return None
+        data = output.getvalue()
+        file_name = f"{hashlib.sha256(data).hexdigest()[:16]}.{THUMBNAIL_FORMAT.lower()}"
+        path = os.path.join(self.thumbnail_cache.directory, file_name)
+        if not os.path.exists(path):
+            with open(path, 'wb') as f:
+                f.write(data)
+        return file_name
+
+    def write_search_index(self, items: List[FeedItem], data_dir: str = FEED_DATA_DIR) -> str:
+        """Write an inverted index of items under a content-hashed name; returns its path.
+
+        The index lists item IDs in page order, the sorted terms, and for each term the
+        delta-encoded positions of the items containing it.
+        """
+        postings: Dict[str, List[int]] = {}
+        for position, item in enumerate(items):
+            for token in self.search_tokens.tokens(item):
+                postings.setdefault(token, []).append(position)
+        terms = sorted(postings)
+        index = {
+            'ids': [item.id for item in items],
+            'terms': terms,
+            'postings': [[p[0]] + [b - a for a, b in zip(p, p[1:])] for p in (postings[t] for t in terms)],
+        }
+        index_bytes = _encode_json(index).encode('utf-8')
+        file_name = f"search.{hashlib.sha256(index_bytes).hexdigest()[:12]}.json"
+        file_path = os.path.join(data_dir, file_name)
+        os.makedirs(data_dir, exist_ok=True)
+        if not os.path.exists(file_path):
+            with open(file_path, 'wb') as f:
+                f.write(index_bytes)
+            if PRECOMPRESS_FEED_DATA:
+                _write_precompressed(file_path, index_bytes)
+        for old_name in os.listdir(data_dir):
+            if old_name.startswith('search.') and re.sub(r'\.(gz|br)$', '', old_name) != file_name:
+                os.remove(os.path.join(data_dir, old_name))
+        logger.info(f"Wrote search index with {len(terms)} terms ({len(index_bytes) // 1024} KB)")
+        return f"{data_dir}/{file_name}"
+
+    def write_precheck_state(self, feed_urls: List[str], oldest_published: Mapping[str, float],
+                             feeds_path: str = 'feeds.txt', path: str = PRECHECK_STATE_PATH) -> None:
+        """Record the validators, body hashes and due times --check uses to tell if the next run can change the page.
+
+        oldest_published maps feed URLs to their oldest stored item; the page expires when the first
+        of those leaves its feed's retention window.
+        """
+        previous = _load_json_file(path, {}).get('feeds', {})
+        feeds = {}
+        for url in feed_urls:
+            feeds[url] = {
+                'due': self.scheduler.state.get(url, {}).get('next_due', 0) if ADAPTIVE_SCHEDULING else 0,
+                'validators': self.feed_cache.conditional_headers(url),
+                # Feeds that were not downloaded this run (not due, 304) still match their last body
+                'body': self.body_digests.get(url) or previous.get(url, {}).get('body'),
+            }
+        expires_at = min((published + (self.utc_now - self.retention_cutoff(url)).total_seconds()
+                          for url, published in oldest_published.items() if url in feeds), default=None)
+        _save_json_file(path, {
+            'feeds_hash': _file_digest(feeds_path),
+            'expires_at': expires_at,
+            'feeds': feeds,
+        })
+
+    def update_html_file(self, json_data: str, template_path: str = 'index.template.html', output_path: str = 'index.html',
+                         manifest: Optional[Dict[str, Any]] = None, events_url: Optional[str] = None) -> None:
+        """Update the HTML file with feed data; events_url points the page at the --serve update stream."""
         logger.info(f"Updating {output_path}")
 
         try:
@@ -562,6 +2779,11 @@ class FeedProcessor:
 
         # Add JSON data
         json_script = f'<script id="feed-data" type="application/json">{json_data}</script>'
+        if manifest is not None:
+            manifest_json = json.dumps(manifest, separators=(',', ':'))
+            json_script = f'<script id="feed-manifest" type="application/json">{manifest_json}</script>\n{json_script}'
+        if events_url:
+            json_script += f'\n<script id="feed-events" type="application/json">{json.dumps({"url": events_url})}</script>'
         template = template.replace('</body>', f'{json_script}\n</body>')
         
         # Update timestamp
@@ -578,25 +2800,440 @@ class FeedProcessor:
             logger.error(f"Could not write {output_path}: {e}")
 
 
+_parse_worker: Optional[FeedProcessor] = None
+
+
+def _init_parse_worker(timezone: str) -> None:
+    """Set up the FeedProcessor a parse worker process reuses for every feed."""
+    global _parse_worker
+    # Workers never open the on-disk item store or caches; each feed arrives with its stored entries
+    _parse_worker = FeedProcessor(timezone, parse_only=True)
+    _parse_worker.description_memo.added = {}
+
+
+def _parse_feed_in_worker(url: str, content: bytes, title_override: Optional[str], options: Optional[Dict[str, Any]],
+                          stored: Dict[str, Tuple[Optional[str], FeedItem]], utc_now: datetime) -> ParsedFeed:
+    """Parse one feed body in a worker process; memo updates are returned to the parent."""
+    processor = _parse_worker
+    processor.utc_now = utc_now  # same retention cutoff as the parent run
+    memo = processor.description_memo
+    processor.feed_title_overrides = {url: title_override} if title_override else {}
+    processor.feed_options = {url: options} if options else {}
+    hits, misses = memo.hits, memo.misses
+    parsed = processor._parse_feed(url, content, stored)
+    parsed.memo_entries, memo.added = memo.added, {}
+    parsed.memo_hits, parsed.memo_misses = memo.hits - hits, memo.misses - misses
+    return parsed
+
+
+def _feed_unchanged(url: str, feed: Mapping[str, Any], rate_limiter: HostRateLimiter) -> bool:
+    """Ask a feed for changes with its stored validators; True on 304 or a body that starts as stored."""
+    wait = rate_limiter.reserve(urlparse(url).hostname or '')
+    if wait:
+        time.sleep(wait)
+    request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT, **feed.get('validators', {})})
+    try:
+        with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT) as response:
+            size, digest = feed.get('body') or (0, None)
+            # The last run may have stopped reading at the retention window; compare that much
+            body = response.read(size) if size else response.read()
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return True
+        logger.info(f"Pre-check: {url} answered {e.code}")
+        return False
+    except (OSError, ValueError) as e:
+        logger.info(f"Pre-check: {url} failed: {e}")
+        return False
+    if len(body) != size or hashlib.sha256(body).hexdigest() != digest:
+        logger.info(f"Pre-check: {url} changed")
+        return False
+    return True
+
+
+def check_for_changes(feeds_path: str = 'feeds.txt', path: str = PRECHECK_STATE_PATH) -> bool:
+    """Return whether a full run could change the page, from the state the last run left behind.
+
+    Only feeds that are due are asked, and the first change ends the check. Uses the standard
+    library alone, so it can run before the dependencies are installed.
+    """
+    state = _load_json_file(path, None)
+    if not state:
+        logger.info("Pre-check: no state from a previous run")
+        return True
+    if state.get('feeds_hash') != _file_digest(feeds_path):
+        logger.info(f"Pre-check: {feeds_path} changed")
+        return True
+    now = time.time()
+    if state.get('expires_at') is not None and state['expires_at'] <= now:
+        logger.info("Pre-check: items on the page have passed the retention window")
+        return True
+
+    breaker = CircuitBreaker()
+    feeds = state.get('feeds', {})
+    due = [url for url, feed in feeds.items()
+           if feed.get('due', 0) <= now + SCHEDULE_GRACE and breaker.allow(urlparse(url).hostname or '', now)]
+    logger.info(f"Pre-check: {len(due)} of {len(feeds)} feeds are due")
+    rate_limiter = HostRateLimiter()
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = [executor.submit(_feed_unchanged, url, feeds[url], rate_limiter) for url in due]
+        for future in as_completed(futures):
+            if not future.result():
+                for pending in futures:
+                    pending.cancel()
+                return True
+    return False
+
+
 def main():
     """Main execution function."""
-    processor = FeedProcessor()
+    parser = argparse.ArgumentParser(description="Fetch feeds and generate index.html")
+    parser.add_argument('--profile', metavar='PATH', help="write cProfile stats for the run to PATH")
+    parser.add_argument('--check', action='store_true',
+                        help=f"only check whether a run could change the page; exit {EXIT_NOTHING_CHANGED} if not")
+    parser.add_argument('--batch', nargs='+', metavar='FEEDS_FILE',
+                        help="fetch the feeds of several feed lists once and write <name>.html for each")
+    parser.add_argument('--serve', action='store_true',
+                        help="keep running: refresh due feeds, serve the page and push new items to open pages")
+    parser.add_argument('--host', default=SERVE_HOST, help="--serve address (default %(default)s)")
+    parser.add_argument('--port', type=int, default=SERVE_PORT, help="--serve port (default %(default)s)")
+    args = parser.parse_args()
+
+    if args.batch:
+        run_batch(args.batch)
+        return
+    if args.serve:
+        serve(args.host, args.port)
+        return
+
+    if args.check:
+        if not check_for_changes():
+            logger.info("Nothing changed since the last run")
+            sys.exit(EXIT_NOTHING_CHANGED)
+        return
+
+    if args.profile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            run()
+        finally:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            logger.info(f"Wrote profile to {args.profile}")
+    else:
+        run()
+
+
+def run(processor: Optional[FeedProcessor] = None, only_if_due: bool = False,
+        events_url: Optional[str] = None) -> Optional[List[FeedItem]]:
+    """Run the fetch pipeline once and write index.html; returns the items on the page.
+
+    --serve passes its long-lived processor, which stays open, and only_if_due, which returns
+    None without writing anything when no feed is due.
+    """
+    report = RunReport()
+    owns_processor = processor is None
+    processor = processor or FeedProcessor()
 
     # Process URLs and fetch feeds
-    feed_urls = processor.process_urls_file('feeds.txt')
-    feed_items, stats = processor.fetch_feeds(feed_urls)
-    sorted_items = processor.sort_items(feed_items)
+    with report.phase('process_urls'):
+        feed_urls = processor.process_urls_file('feeds.txt')
+    now = processor.utc_now.timestamp()
+    due_urls = processor.scheduler.due_feeds(feed_urls, now) if ADAPTIVE_SCHEDULING else feed_urls
+    if only_if_due and not due_urls:
+        return None
+    stats = _update_item_store(processor, feed_urls, due_urls, report)
+    with report.phase('sort'):
+        sorted_items = processor.item_store.load_items(MAX_ITEMS, MAX_ITEMS_PER_FEED,
+                                                       feed_caps=processor.feed_caps())
+        oldest_published = processor.item_store.oldest_published()
+        if owns_processor:
+            processor.item_store.close()
+        else:
+            processor.item_store.commit()
+    sorted_items = _write_page(processor, sorted_items, report, events_url=events_url)
+    if SEARCH_INDEX:
+        processor.search_tokens.save()
+    if THUMBNAIL_CACHE:
+        processor.thumbnail_cache.save()
+    processor.write_precheck_state(feed_urls, oldest_published)
+
+    report.write(stats, len(sorted_items))
+    logger.info(f"Successfully processed {len(sorted_items)} items")
+    if stats.failed > 0:
+        logger.warning(f"Note: {stats.failed} feeds failed to fetch")
+    return sorted_items
+
+
+def _update_item_store(processor: FeedProcessor, feed_urls: List[str], due_urls: List[str],
+                       report: RunReport) -> FeedStats:
+    """Fetch the due feeds, save the caches and merge the results into the item store."""
+    now = processor.utc_now.timestamp()
+    if len(due_urls) < len(feed_urls):
+        logger.info(f"Skipping {len(feed_urls) - len(due_urls)} feeds that are not due; reusing their stored items")
+    with report.phase('fetch'):
+        stats = processor.fetch_feeds(due_urls)
+    with report.phase('save_caches'):
+        processor.feed_cache.prune(feed_urls)
+        processor.feed_cache.save()
+        processor.description_memo.save()
+        processor.circuit_breaker.save()
+
+    # Merge this run's deltas into the item store; feeds that failed keep their stored items
+    with report.phase('merge'):
+        cutoff_time = processor.utc_now - timedelta(days=ITEMS_RETENTION_DAYS)
+        feed_cutoffs = {url: processor.retention_cutoff(url) for url, options in processor.feed_options.items()
+                        if 'retention' in options}
+        processor.item_store.evict(cutoff_time, feed_urls, feed_cutoffs)
+        processor.scheduler.update(stats, processor.item_store.feed_published_times(), now)
+        processor.scheduler.prune(feed_urls)
+        processor.scheduler.save()
+    return stats
+
+
+def _write_page(processor: FeedProcessor, items: List[FeedItem], report: RunReport,
+                output_path: str = 'index.html', data_dir: str = FEED_DATA_DIR,
+                events_url: Optional[str] = None) -> List[FeedItem]:
+    """Dedupe items and write them as one page; returns the items on the page."""
+    with report.phase('dedupe'):
+        if DEDUPE_ITEMS:
+            items = processor.dedupe_items(items)
+        else:
+            # Entries listed by several feeds are stored once per feed; the page shows each ID once
+            seen = set()
+            unique = []
+            for item in items:
+                if item.id not in seen:
+                    seen.add(item.id)
+                    unique.append(item)
+            items = unique
+    if THUMBNAIL_CACHE:
+        with report.phase('thumbnails'):
+            processor.localize_thumbnails(items)
 
     # Generate JSON
-    json_data = processor.process_items_for_display(sorted_items)
+    manifest = None
+    with report.phase('serialize'):
+        if SHARD_FEED_DATA:
+            json_data, manifest = processor.write_feed_shards(items, data_dir)
+        else:
+            json_data = processor.process_items_for_display(items)
+    if SEARCH_INDEX:
+        with report.phase('search_index'):
+            manifest = manifest or {'inline': None, 'shards': []}
+            manifest['search'] = processor.write_search_index(items, data_dir)
 
     # Update HTML file
-    processor.update_html_file(json_data)
+    with report.phase('write_html'):
+        processor.update_html_file(json_data, output_path=output_path, manifest=manifest, events_url=events_url)
+    return items
 
-    logger.info(f"Successfully processed {len(sorted_items)} items")
+
+def _feed_list_name(path: str) -> str:
+    """Name a feed list by its file name, or by its directory for files called feeds.txt."""
+    name = os.path.splitext(os.path.basename(path))[0]
+    if name == 'feeds':
+        name = os.path.basename(os.path.dirname(os.path.abspath(path)))
+    return name
+
+
+def run_batch(feed_lists: List[str]) -> None:
+    """Fetch the feeds of several feed lists once and write one page per list.
+
+    A feed listed by several lists is fetched and processed once. Each list then gets its own
+    <name>.html with shards under data/<name>/, built from the shared item store.
+    """
+    report = RunReport()
+    processor = FeedProcessor()
+
+    lists: Dict[str, List[str]] = {}
+    list_titles: Dict[str, Dict[str, str]] = {}
+    list_options: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    feed_hosts: Dict[str, str] = {}
+    with report.phase('process_urls'):
+        for path in feed_lists:
+            name = _feed_list_name(path)
+            if name in lists:
+                raise ValueError(f"Feed list {path} has the same name as an earlier list: {name}")
+            lists[name] = processor.process_urls_file(path)
+            list_titles[name] = processor.feed_title_overrides
+            list_options[name] = processor.feed_options
+            feed_hosts.update(processor.feed_hosts)
+        feed_urls = list(dict.fromkeys(url for urls in lists.values() for url in urls))
+        # Titles, caps and retention belong to each list and are applied when its page is loaded.
+        # The shared fetch keeps a feed's items as long as the longest retention any of its lists asks for.
+        members = {name: set(urls) for name, urls in lists.items()}
+        feed_options: Dict[str, Dict[str, Any]] = {}
+        for url in feed_urls:
+            retentions = [list_options[name].get(url, {}).get('retention') for name in lists if url in members[name]]
+            if None not in retentions:
+                feed_options[url] = {'retention': max(retentions)}
+        processor.feed_title_overrides = {}
+        processor.feed_options = feed_options
+        processor.feed_hosts = feed_hosts
+    subscriptions = sum(len(urls) for urls in lists.values())
+    logger.info(f"{len(feed_urls)} unique feeds across {len(lists)} feed lists ({subscriptions} subscriptions)")
+
+    now = processor.utc_now.timestamp()
+    due_urls = processor.scheduler.due_feeds(feed_urls, now) if ADAPTIVE_SCHEDULING else feed_urls
+    stats = _update_item_store(processor, feed_urls, due_urls, report)
+
+    item_count = 0
+    for name, urls in lists.items():
+        options = list_options[name]
+        cutoffs = {url: processor.retention_cutoff(url, options).timestamp()
+                   for url, feed in options.items() if 'retention' in feed}
+        with report.phase('sort'):
+            items = processor.item_store.load_items(MAX_ITEMS, MAX_ITEMS_PER_FEED, feed_urls=members[name],
+                                                    feed_caps=processor.feed_caps(options), feed_cutoffs=cutoffs,
+                                                    feed_titles=list_titles[name])
+        items = _write_page(processor, items, report, output_path=f"{name}.html", data_dir=f"{FEED_DATA_DIR}/{name}")
+        logger.info(f"Wrote {len(items)} items for {name}")
+        item_count += len(items)
+    processor.item_store.close()
+    if SEARCH_INDEX:
+        processor.search_tokens.save()
+    if THUMBNAIL_CACHE:
+        processor.thumbnail_cache.save()
+
+    report.write(stats, item_count)
     if stats.failed > 0:
         logger.warning(f"Note: {stats.failed} feeds failed to fetch")
 
 
+class EventBroadcaster:
+    """Fans server-sent events out to connected clients and keeps a short backlog for reconnects."""
+
+    def __init__(self, backlog: int = SERVE_EVENT_BACKLOG):
+        self._lock = threading.Lock()
+        self._clients: List['queue.Queue[Tuple[int, str, str]]'] = []
+        self._backlog: 'deque[Tuple[int, str, str]]' = deque(maxlen=backlog)
+        self._last_id = 0
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    def publish(self, event: str, data: str) -> None:
+        with self._lock:
+            self._last_id += 1
+            message = (self._last_id, event, data)
+            self._backlog.append(message)
+            for client in self._clients:
+                client.put(message)
+
+    def subscribe(self, last_id: Optional[int] = None) -> 'queue.Queue[Tuple[int, str, str]]':
+        """Return a queue of future events, preloaded with the backlog after last_id."""
+        client: 'queue.Queue[Tuple[int, str, str]]' = queue.Queue()
+        with self._lock:
+            if last_id is not None:
+                for message in self._backlog:
+                    if message[0] > last_id:
+                        client.put(message)
+            self._clients.append(client)
+        return client
+
+    def unsubscribe(self, client: 'queue.Queue[Tuple[int, str, str]]') -> None:
+        with self._lock:
+            self._clients.remove(client)
+
+
+class _ServeHandler(http.server.SimpleHTTPRequestHandler):
+    """Serves the generated site from the working directory, plus the /events update stream."""
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def end_headers(self) -> None:
+        # Shards and thumbnails have content-hashed names; everything else can change on the next refresh
+        if not self.path.startswith((f'/{FEED_DATA_DIR}/', f'/{THUMBNAIL_DIR}/')):
+            self.send_header('Cache-Control', 'no-cache')
+        super().end_headers()
+
+    def do_GET(self) -> None:
+        if urlsplit(self.path).path == '/events':
+            self._stream_events()
+        else:
+            super().do_GET()
+
+    def send_head(self) -> Any:
+        # Only the site is public: .git/, .cache/ and feeds.txt share the working directory
+        path = posixpath.normpath(unquote(urlsplit(self.path).path))
+        if path not in SERVE_FILES and not path.startswith(SERVE_DIRS + (f'/{FEED_DATA_DIR}/', f'/{THUMBNAIL_DIR}/')):
+            self.send_error(404, 'File not found')
+            return None
+        return super().send_head()
+
+    def list_directory(self, path: str) -> None:
+        self.send_error(404, 'File not found')
+        return None
+
+    def _stream_events(self) -> None:
+        last_id = self.headers.get('Last-Event-ID', '')
+        broadcaster: EventBroadcaster = self.server.broadcaster
+        client = broadcaster.subscribe(int(last_id) if last_id.isdigit() else None)
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.end_headers()
+            self.wfile.write(f"retry: {SERVE_TICK * 1000}\n\n".encode('utf-8'))
+            self.wfile.flush()
+            while True:
+                try:
+                    event_id, event, data = client.get(timeout=SERVE_KEEPALIVE)
+                    message = f"id: {event_id}\nevent: {event}\ndata: {data}\n\n"
+                except queue.Empty:
+                    message = ": keepalive\n\n"
+                self.wfile.write(message.encode('utf-8'))
+                self.wfile.flush()
+        except (ConnectionError, OSError):
+            pass  # client went away
+        finally:
+            broadcaster.unsubscribe(client)
+
+
+def serve(host: str = SERVE_HOST, port: int = SERVE_PORT) -> None:
+    """Refresh due feeds every SERVE_TICK seconds with one warm FeedProcessor and serve the page.
+
+    Connection pools, caches, the item store and the parse pool stay open between refreshes.
+    Items that appear in a refresh are pushed to open pages as an "items" event on /events.
+    """
+    processor = FeedProcessor()
+    processor.scheduler.min_interval = SERVE_MIN_INTERVAL
+    processor.scheduler.grace = SERVE_TICK
+    broadcaster = EventBroadcaster()
+    httpd = http.server.ThreadingHTTPServer((host, port), partial(_ServeHandler, directory=os.getcwd()))
+    httpd.daemon_threads = True
+    httpd.broadcaster = broadcaster
+    threading.Thread(target=httpd.serve_forever, name='serve-http', daemon=True).start()
+    logger.info(f"Serving on http://{host}:{httpd.server_address[1]}/, refreshing due feeds every {SERVE_TICK}s")
+
+    shown: Optional[set] = None
+    try:
+        with processor._parse_processes():
+            while True:
+                started = time.monotonic()
+                processor.utc_now = datetime.now(pytz.utc)
+                try:
+                    items = run(processor, only_if_due=shown is not None, events_url='events')
+                except Exception as e:
+                    logger.error(f"Refresh failed: {e}")
+                    items = None
+                if items is not None:
+                    fresh = [item for item in items if shown is not None and item.id not in shown]
+                    if fresh:
+                        broadcaster.publish('items', processor._generate_all_items_json(fresh))
+                        logger.info(f"Pushed {len(fresh)} new items to {broadcaster.client_count} clients")
+                    shown = {item.id for item in items}
+                time.sleep(max(0.0, SERVE_TICK - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        logger.info("Stopping")
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        processor.item_store.close()
+
+
 if __name__ == "__main__":
     main()
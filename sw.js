@@ -1,4 +1,7 @@
-const CACHE_VERSION = 'blink-v12.1';
+const CACHE_VERSION = 'blink-v12.10';
+// Feed shards have content-hashed names, so they never change once cached.
+// The page prunes shards that drop out of the manifest.
+const DATA_CACHE = 'blink-data';
 const PRECACHE_ASSETS = [
   './',
   'index.html',
@@ -33,6 +36,10 @@ function isHtmlRequest(request) {
     || (request.headers.get('accept') || '').includes('text/html');
 }
 
+function isFeedShardRequest(url) {
+  return /\/data\/(?:[^/]+\/)?[^/]+\.json$/.test(url.pathname);
+}
+
 function isStaticAssetRequest(request, url) {
   return ['font', 'image', 'manifest', 'script', 'style', 'worker'].includes(request.destination)
     || PRECACHE_ASSETS.some((asset) => new URL(asset, location.href).pathname === url.pathname);
@@ -50,7 +57,7 @@ self.addEventListener('activate', (event) => {
   event.waitUntil(
     caches.keys()
       .then((keys) => Promise.all(
-        keys.filter((k) => k !== CACHE_VERSION).map((k) => caches.delete(k))
+        keys.filter((k) => k !== CACHE_VERSION && k !== DATA_CACHE).map((k) => caches.delete(k))
       ))
       .then(() => self.clients.claim())
   );
@@ -78,6 +85,19 @@ self.addEventListener('fetch', (event) => {
     return;
   }
 
+  // Cache-first for immutable feed shards.
+  if (isFeedShardRequest(url)) {
+    event.respondWith(
+      caches.open(DATA_CACHE).then((cache) =>
+        cache.match(event.request).then((cached) => cached || fetch(event.request).then((response) => {
+          if (response.ok) cache.put(event.request, response.clone());
+          return response;
+        }))
+      )
+    );
+    return;
+  }
+
   if (!isStaticAssetRequest(event.request, url)) return;
 
   // Stale-while-revalidate for same-origin static assets.